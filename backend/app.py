@@ -1,25 +1,44 @@
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+from quart import Quart, Response, request
+from quart.json.provider import JSONProvider
+from quart_cors import cors
 import os
+import sys
 import json
+import gzip
+import asyncio
+import orjson
 from datetime import datetime
 import logging
-from typing import Dict, List, Optional, Any
-import asyncio
-import requests
+from typing import Dict, List, Optional, Any, AsyncIterator, Tuple, Union
 
 # Import AI service modules
-from services.ai_service import AIService
+from services.ai_service import AIService, ProviderError
 from services.question_generator import QuestionGenerator
 from services.answer_analyzer import AnswerAnalyzer
 from services.report_generator import ReportGenerator
+from services import metrics_kernel
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
-CORS(app)  # Enable CORS for browser extension
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson, used for request parsing"""
+    
+    def dumps(self, obj: Any, **kwargs) -> str:
+        return orjson.dumps(obj).decode()
+    
+    def loads(self, s: Union[str, bytes], **kwargs) -> Any:
+        return orjson.loads(s)
+
+app = Quart(__name__)
+app.json = OrjsonProvider(app)
+app = cors(app, allow_origin="*")  # Enable CORS for browser extension
 
 # Initialize AI services
 ai_service = AIService()
@@ -27,20 +46,117 @@ question_generator = QuestionGenerator(ai_service)
 answer_analyzer = AnswerAnalyzer(ai_service)
 report_generator = ReportGenerator(ai_service)
 
+def ojsonify(obj: Any, status: int = 200) -> Response:
+    """Serialize a JSON response with orjson"""
+    return Response(orjson.dumps(obj), status=status, mimetype='application/json')
+
+# Smaller bodies aren't worth the compression overhead
+_COMPRESS_MIN_BYTES = 1024
+_ENCODINGS = ['br', 'gzip'] if brotli is not None else ['gzip']
+
+def provider_error_response(error: ProviderError) -> Response:
+    """Map a provider failure to a short JSON error, passing through rate-limit hints"""
+    logger.warning(f"{error.provider} API error {error.status}: {error.message}")
+    response = ojsonify({
+        'success': False,
+        'error': f'{error.provider} API error',
+        'retryable': error.retryable
+    }, 429 if error.status == 429 else 502)
+    if error.retry_after is not None:
+        response.headers['Retry-After'] = str(int(error.retry_after))
+    return response
+
+def _sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Event with a JSON payload"""
+    return f"event: {event}\ndata: {orjson.dumps(data).decode()}\n\n"
+
+def sse_response(events: AsyncIterator[Tuple[str, Any]], action: str) -> Response:
+    """Stream (event, data) pairs as Server-Sent Events, ending with a done or error event"""
+    async def stream():
+        try:
+            async for event, data in events:
+                yield _sse_event(event, data)
+            yield _sse_event('done', {'timestamp': _ts['v']})
+        except ProviderError as e:
+            logger.warning(f"{e.provider} API error {e.status}: {e.message}")
+            yield _sse_event('error', {'error': f'{e.provider} API error', 'retryable': e.retryable})
+        except Exception as e:
+            message = str(e)
+            logger.error(f"Error {action}: {message}")
+            yield _sse_event('error', {'error': message})
+    
+    response = Response(stream(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.timeout = None  # Streams such as reports can outlast the default response timeout
+    return response
+
+# Response timestamp, refreshed once per second instead of formatted per request
+_ts = {"v": datetime.now().isoformat()}
+
+async def _refresh_timestamp():
+    while True:
+        await asyncio.sleep(1)
+        _ts["v"] = datetime.now().isoformat()
+
+@app.before_serving
+async def start_timestamp_refresh():
+    """Start the background timestamp refresher"""
+    _ts["v"] = datetime.now().isoformat()
+    app.timestamp_task = asyncio.create_task(_refresh_timestamp())
+
+@app.before_serving
+async def warm_metrics_kernel():
+    """Compile the report metrics kernel before the first request needs it"""
+    await asyncio.to_thread(metrics_kernel.warm_up)
+
+@app.after_serving
+async def stop_timestamp_refresh():
+    """Stop the background timestamp refresher"""
+    app.timestamp_task.cancel()
+
+@app.after_serving
+async def close_http_session():
+    """Release pooled provider connections on shutdown"""
+    await ai_service.http.close()
+
+@app.after_request
+async def compress_response(response: Response) -> Response:
+    """Compress large JSON responses with Brotli or gzip when the client accepts it"""
+    # Server-sent event streams must reach the client unbuffered, so only JSON is compressed
+    if response.mimetype != 'application/json' or 'Content-Encoding' in response.headers:
+        return response
+    
+    body = await response.get_data()
+    if len(body) < _COMPRESS_MIN_BYTES:
+        return response
+    
+    # The body depends on Accept-Encoding whether or not this client gets it compressed
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(_ENCODINGS)
+    if encoding is None:
+        return response
+    
+    if encoding == 'br':
+        response.set_data(brotli.compress(body, quality=5))
+    else:
+        response.set_data(gzip.compress(body, compresslevel=6))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
 @app.route('/health', methods=['GET'])
-def health_check():
+async def health_check():
     """Health check endpoint"""
-    return jsonify({
+    return ojsonify({
         'status': 'healthy',
         'timestamp': datetime.now().isoformat(),
         'ai_provider': ai_service.get_current_provider()
     })
 
 @app.route('/api/suggest-questions', methods=['POST'])
-def suggest_questions():
+async def suggest_questions():
     """Generate interview questions based on context"""
     try:
-        data = request.get_json()
+        data = await request.get_json()
         
         # Extract parameters
         context = data.get('context', '')
@@ -49,120 +165,207 @@ def suggest_questions():
         previous_questions = data.get('previous_questions', [])
         candidate_info = data.get('candidate_info', {})
         
-        # Generate questions (run async function)
-        questions = asyncio.run(question_generator.generate_questions(
+        # Generate questions
+        questions = await question_generator.generate_questions(
             context=context,
             question_type=question_type,
             count=count,
             previous_questions=previous_questions,
             candidate_info=candidate_info
-        ))
+        )
         
-        return jsonify({
+        return ojsonify({
             'success': True,
             'questions': questions,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _ts["v"]
         })
         
+    except ProviderError as e:
+        return provider_error_response(e)
+        
     except Exception as e:
-        logger.error(f"Error generating questions: {str(e)}")
-        return jsonify({
+        message = str(e)
+        logger.error(f"Error generating questions: {message}")
+        return ojsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': message
+        }, 500)
 
 @app.route('/api/analyze-answer', methods=['POST'])
-def analyze_answer():
+async def analyze_answer():
     """Analyze and rate an interview answer"""
     try:
-        data = request.get_json()
+        data = await request.get_json()
         
         # Extract parameters
         question = data.get('question', '')
         answer = data.get('answer', '')
         context = data.get('context', {})
         
-        # Analyze answer (run async function)
-        analysis = asyncio.run(answer_analyzer.analyze_answer(
+        # Analyze answer
+        analysis = await answer_analyzer.analyze_answer(
             question=question,
             answer=answer,
             context=context
-        ))
+        )
         
-        return jsonify({
+        return ojsonify({
             'success': True,
             'analysis': analysis,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _ts["v"]
         })
         
+    except ProviderError as e:
+        return provider_error_response(e)
+        
     except Exception as e:
-        logger.error(f"Error analyzing answer: {str(e)}")
-        return jsonify({
+        message = str(e)
+        logger.error(f"Error analyzing answer: {message}")
+        return ojsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': message
+        }, 500)
+
+@app.route('/api/analyze-answer/stream', methods=['POST'])
+async def analyze_answer_stream():
+    """Stream an answer analysis field by field as Server-Sent Events"""
+    data = await request.get_json()
+    question = data.get('question', '')
+    answer = data.get('answer', '')
+    context = data.get('context', {})
+    
+    async def events():
+        async for field in answer_analyzer.analyze_answer_stream(question, answer, context):
+            yield 'field', field
+    
+    return sse_response(events(), "streaming answer analysis")
+
+@app.route('/api/analyze-answers', methods=['POST'])
+async def analyze_answers():
+    """Analyze a batch of interview answers concurrently"""
+    try:
+        data = await request.get_json()
+        
+        items = [
+            (item.get('question', ''), item.get('answer', ''), item.get('context', {}))
+            for item in data.get('items', [])
+        ]
+        
+        analyses = await answer_analyzer.analyze_answers(items)
+        
+        return ojsonify({
+            'success': True,
+            'analyses': analyses,
+            'timestamp': _ts["v"]
+        })
+        
+    except ProviderError as e:
+        return provider_error_response(e)
+        
+    except Exception as e:
+        message = str(e)
+        logger.error(f"Error analyzing answers: {message}")
+        return ojsonify({
+            'success': False,
+            'error': message
+        }, 500)
+
+@app.route('/api/analyze-answers/stream', methods=['POST'])
+async def analyze_answers_stream():
+    """Stream batch answer analyses as Server-Sent Events, in completion order"""
+    data = await request.get_json()
+    items = [
+        (item.get('question', ''), item.get('answer', ''), item.get('context', {}))
+        for item in data.get('items', [])
+    ]
+    
+    async def events():
+        async for index, analysis in answer_analyzer.analyze_answers_stream(items):
+            yield 'analysis', {'index': index, 'analysis': analysis}
+    
+    return sse_response(events(), "streaming answer analyses")
 
 @app.route('/api/suggest-followup', methods=['POST'])
-def suggest_followup():
+async def suggest_followup():
     """Suggest follow-up questions based on previous Q&A"""
     try:
-        data = request.get_json()
+        data = await request.get_json()
         
         # Extract parameters
         question = data.get('question', '')
         answer = data.get('answer', '')
         qa_history = data.get('qa_history', [])
         
-        # Generate follow-up questions (run async function)
-        followup_questions = asyncio.run(question_generator.generate_followup_questions(
+        # Generate follow-up questions
+        followup_questions = await question_generator.generate_followup_questions(
             question=question,
             answer=answer,
             qa_history=qa_history
-        ))
+        )
         
-        return jsonify({
+        return ojsonify({
             'success': True,
             'followup_questions': followup_questions,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _ts["v"]
         })
         
+    except ProviderError as e:
+        return provider_error_response(e)
+        
     except Exception as e:
-        logger.error(f"Error generating follow-up questions: {str(e)}")
-        return jsonify({
+        message = str(e)
+        logger.error(f"Error generating follow-up questions: {message}")
+        return ojsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': message
+        }, 500)
 
 @app.route('/api/generate-report', methods=['POST'])
-def generate_report():
+async def generate_report():
     """Generate comprehensive interview report"""
     try:
-        data = request.get_json()
+        data = await request.get_json()
         
         # Extract interview data
         interview_data = data.get('interview_data', {})
         
-        # Generate report (run async function)
-        report = asyncio.run(report_generator.generate_report(interview_data))
+        # Generate report
+        report = await report_generator.generate_report(interview_data)
         
-        return jsonify({
+        return ojsonify({
             'success': True,
             'report': report,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': _ts["v"]
         })
         
+    except ProviderError as e:
+        return provider_error_response(e)
+        
     except Exception as e:
-        logger.error(f"Error generating report: {str(e)}")
-        return jsonify({
+        message = str(e)
+        logger.error(f"Error generating report: {message}")
+        return ojsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': message
+        }, 500)
+
+@app.route('/api/generate-report/stream', methods=['POST'])
+async def generate_report_stream():
+    """Stream an interview report's sections as Server-Sent Events as each one is ready"""
+    data = await request.get_json()
+    interview_data = data.get('interview_data', {})
+    
+    async def events():
+        async for section, content in report_generator.generate_report_stream(interview_data):
+            yield 'section', {'section': section, 'content': content}
+    
+    return sse_response(events(), "streaming report")
 
 @app.route('/api/configure-ai', methods=['POST'])
-def configure_ai():
+async def configure_ai():
     """Configure AI provider and settings"""
     try:
-        data = request.get_json()
+        data = await request.get_json()
         
         provider = data.get('provider', 'gemini')
         api_key = data.get('api_key', '')
@@ -178,40 +381,73 @@ def configure_ai():
         )
         
         if success:
-            return jsonify({
+            return ojsonify({
                 'success': True,
                 'message': f'AI provider configured: {provider}',
                 'provider': provider
             })
         else:
-            return jsonify({
+            return ojsonify({
                 'success': False,
                 'error': 'Failed to configure AI provider'
-            }), 400
+            }, 400)
             
     except Exception as e:
-        logger.error(f"Error configuring AI: {str(e)}")
-        return jsonify({
+        message = str(e)
+        logger.error(f"Error configuring AI: {message}")
+        return ojsonify({
             'success': False,
-            'error': str(e)
-        }), 500
+            'error': message
+        }, 500)
 
 @app.route('/api/providers', methods=['GET'])
-def get_providers():
+async def get_providers():
     """Get list of available AI providers"""
     providers = ai_service.get_available_providers()
-    return jsonify({
+    return ojsonify({
         'success': True,
-        'providers': providers
+        # orjson cannot serialize the read-only mapping proxies directly
+        'providers': [dict(provider) for provider in providers]
     })
 
 @app.errorhandler(404)
-def not_found(error):
-    return jsonify({'error': 'Endpoint not found'}), 404
+async def not_found(error):
+    return ojsonify({'error': 'Endpoint not found'}, 404)
 
 @app.errorhandler(500)
-def internal_error(error):
-    return jsonify({'error': 'Internal server error'}), 500
+async def internal_error(error):
+    return ojsonify({'error': 'Internal server error'}, 500)
+
+def install_uvloop() -> bool:
+    """Run the event loop on uvloop when it is installed (not available on Windows)"""
+    if sys.platform == 'win32':
+        return False
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    uvloop.install()
+    return True
+
+def run_server(port: int, debug: bool = False):
+    """Serve the app: Quart's reloading dev server when debugging, Hypercorn on uvloop otherwise"""
+    if install_uvloop():
+        logger.info("Using uvloop event loop")
+    
+    if debug:
+        app.run(host='0.0.0.0', port=port, debug=True)
+        return
+    
+    from hypercorn.asyncio import serve
+    from hypercorn.config import Config
+    
+    config = Config()
+    config.bind = [f"0.0.0.0:{port}"]
+    config.accesslog = logger
+    config.errorlog = logger
+    # A single async worker overlaps the upstream LLM waits; for more processes run:
+    #   hypercorn app:app --bind 0.0.0.0:5000 --workers 4 --worker-class uvloop
+    asyncio.run(serve(app, config))
 
 if __name__ == '__main__':
     # Load environment variables
@@ -225,4 +461,4 @@ if __name__ == '__main__':
     logger.info(f"Starting Smart Interviewer backend on port {port}")
     logger.info(f"Debug mode: {debug}")
     
-    app.run(host='0.0.0.0', port=port, debug=debug)
+    run_server(port, debug)
@@ -1,13 +1,241 @@
 import os
+import re
+import copy
 import json
+import hashlib
 import asyncio
-import requests
+import functools
+import orjson
+from types import MappingProxyType
+from cachetools import LRUCache, TTLCache
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, AsyncIterator, Tuple
 import logging
 
+from .semantic_cache import SemanticCache
+
+try:
+    import aiohttp
+except ImportError:
+    # requirements-windows.txt ships without aiohttp; fall back to a pooled requests session
+    aiohttp = None
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
 logger = logging.getLogger(__name__)
 
+if aiohttp is None:
+    _SESSION = requests.Session()
+    _SESSION.mount("https://", HTTPAdapter(
+        pool_connections=20,
+        pool_maxsize=100,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(["POST"])
+        )
+    ))
+
+class ProviderError(Exception):
+    """Error response from an AI provider API"""
+    
+    def __init__(self, provider: str, status: int, message: str, retry_after: Optional[float] = None):
+        super().__init__(f"{provider} API error: {status} - {message}")
+        self.provider = provider
+        self.status = status
+        self.message = message
+        self.retry_after = retry_after
+    
+    @property
+    def retryable(self) -> bool:
+        """Rate limits and server errors are worth retrying later"""
+        return self.status == 429 or self.status >= 500
+
+def _provider_error(name: str, status: int, body: str, retry_after: Optional[str]) -> ProviderError:
+    """Build a ProviderError with the provider's short error message rather than the whole body"""
+    try:
+        message = orjson.loads(body)["error"]["message"]
+    except (orjson.JSONDecodeError, KeyError, TypeError):
+        message = body[:200]
+    try:
+        retry_after = float(retry_after) if retry_after else None
+    except ValueError:
+        retry_after = None
+    return ProviderError(name, status, message, retry_after)
+
+def _extract_json(text: str) -> Dict:
+    """Extract the first JSON object embedded in surrounding model text"""
+    decoder = json.JSONDecoder()
+    start = text.find("{")
+    while start != -1:
+        try:
+            obj, _ = decoder.raw_decode(text, start)
+            return obj
+        except json.JSONDecodeError:
+            start = text.find("{", start + 1)
+    raise ValueError("Could not parse structured response as JSON")
+
+_SEPARATORS_RE = re.compile(r'[\s,]*')
+_WHITESPACE_RE = re.compile(r'\s*')
+
+class _JSONFieldParser:
+    """Incrementally parse the top-level fields of a JSON object as its text streams in"""
+    
+    def __init__(self):
+        self._buffer = ""
+        self._search = 0  # Where to look for the object's opening brace
+        self._pos = None  # Just past the opening brace or the last complete value
+        self._started = False  # Whether a field of the object has been parsed
+        self._decoder = json.JSONDecoder()
+    
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Add streamed text and return the (key, value) fields completed by it"""
+        self._buffer += chunk
+        if not self._started and not self._find_object():
+            return []
+        
+        fields = []
+        field = self._next_field()
+        while field is not None:
+            fields.append(field)
+            field = self._next_field()
+        return fields
+    
+    def _find_object(self) -> bool:
+        """Settle on the first brace that can open a JSON object, skipping braces in prose"""
+        buffer = self._buffer
+        while True:
+            if self._pos is None:
+                start = buffer.find("{", self._search)
+                if start == -1:
+                    return False
+                self._pos = start + 1
+            pos = _WHITESPACE_RE.match(buffer, self._pos).end()
+            if pos >= len(buffer):
+                return False
+            if buffer[pos] in '"}':
+                return True
+            self._search, self._pos = self._pos, None
+    
+    def _next_field(self) -> Optional[Tuple[str, Any]]:
+        buffer = self._buffer
+        pos = _SEPARATORS_RE.match(buffer, self._pos).end()
+        if pos >= len(buffer) or buffer[pos] != '"':
+            return None
+        try:
+            key, pos = self._decoder.raw_decode(buffer, pos)
+            pos = _WHITESPACE_RE.match(buffer, pos).end()
+            if buffer[pos:pos + 1] != ":":
+                return None
+            pos = _WHITESPACE_RE.match(buffer, pos + 1).end()
+            value, end = self._decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            return None
+        
+        # Only accept a value once its delimiter arrives; a number may still be growing
+        if buffer[_WHITESPACE_RE.match(buffer, end).end():][:1] not in (",", "}"):
+            return None
+        
+        self._pos = end
+        self._started = True
+        return key, value
+
+@functools.lru_cache(maxsize=256)
+def _schema_str(schema_key: str) -> str:
+    """Render a canonical schema key as the indented JSON shown to the model"""
+    return orjson.dumps(orjson.loads(schema_key), option=orjson.OPT_INDENT_2).decode()
+
+class HTTPClient:
+    """Shared HTTP session so provider calls reuse pooled keep-alive connections
+    
+    Uses aiohttp when installed, otherwise the module-level requests session
+    run in worker threads.
+    """
+    
+    def __init__(self):
+        self._session = None
+    
+    async def get_session(self) -> "aiohttp.ClientSession":
+        """Get the pooled session, creating it on the running event loop if needed"""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    # Every report section can hit the same provider host at once
+                    limit_per_host=50,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60
+                )
+            )
+        return self._session
+    
+    async def post(self, url: str, headers: Dict, payload: Dict, name: str, params: Dict = None) -> Any:
+        """POST JSON and return the decoded response, raising ProviderError on failure"""
+        # Providers send a JSON Content-Type header, so the body is encoded with orjson directly
+        body = orjson.dumps(payload)
+        if aiohttp is None:
+            response = await asyncio.to_thread(
+                _SESSION.post, url, headers=headers, data=body, params=params, timeout=30
+            )
+            if response.status_code == 200:
+                return orjson.loads(response.content)
+            raise _provider_error(name, response.status_code, response.text, response.headers.get("Retry-After"))
+        
+        session = await self.get_session()
+        async with session.post(
+            url,
+            headers=headers,
+            data=body,
+            params=params,
+            timeout=aiohttp.ClientTimeout(total=30)
+        ) as response:
+            if response.status == 200:
+                return orjson.loads(await response.read())
+            raise _provider_error(name, response.status, await response.text(), response.headers.get("Retry-After"))
+    
+    async def stream_lines(self, url: str, headers: Dict, payload: Dict, name: str, params: Dict = None) -> AsyncIterator[str]:
+        """POST JSON and yield the decoded lines of a streaming response"""
+        body = orjson.dumps(payload)
+        if aiohttp is None:
+            response = await asyncio.to_thread(
+                _SESSION.post, url, headers=headers, data=body, params=params, timeout=(30, 30), stream=True
+            )
+            try:
+                if response.status_code != 200:
+                    raise _provider_error(name, response.status_code, response.text, response.headers.get("Retry-After"))
+                lines = response.iter_lines(decode_unicode=True)
+                while True:
+                    line = await asyncio.to_thread(next, lines, None)
+                    if line is None:
+                        break
+                    yield line
+            finally:
+                response.close()
+            return
+        
+        session = await self.get_session()
+        async with session.post(
+            url,
+            headers=headers,
+            data=body,
+            params=params,
+            # Long generations may exceed a total deadline; only bound the gaps between chunks
+            timeout=aiohttp.ClientTimeout(total=None, sock_read=30)
+        ) as response:
+            if response.status != 200:
+                raise _provider_error(name, response.status, await response.text(), response.headers.get("Retry-After"))
+            
+            async for line in response.content:
+                yield line.decode("utf-8")
+    
+    async def close(self):
+        """Close the pooled session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
 class AIProvider(ABC):
     """Abstract base class for AI providers"""
     
@@ -15,10 +243,43 @@ class AIProvider(ABC):
     async def generate_text(self, prompt: str, **kwargs) -> str:
         pass
     
+    def _build_structured_prompt(self, prompt: str, schema: Dict) -> str:
+        """Append the JSON schema instructions to a prompt"""
+        schema_key = orjson.dumps(schema, option=orjson.OPT_SORT_KEYS).decode()
+        return f"""
+            {prompt}
+            
+            Please respond with a valid JSON object that matches this schema:
+            {_schema_str(schema_key)}
+            
+            Return only the JSON object, no additional text.
+            """
+    
+    async def generate_structured_response(self, prompt: str, schema: Dict, **kwargs) -> Dict:
+        """Generate structured response using the provider's text generation"""
+        response_text = await self.generate_text(self._build_structured_prompt(prompt, schema), **kwargs)
+        
+        # Try to parse JSON response
+        try:
+            return orjson.loads(response_text)
+        except orjson.JSONDecodeError:
+            # If JSON parsing fails, try to extract JSON from response
+            return _extract_json(response_text)
+    
     @abstractmethod
-    async def generate_structured_response(self, prompt: str, schema: Dict) -> Dict:
+    async def stream_text(self, prompt: str, **kwargs) -> AsyncIterator[str]:
         pass
     
+    async def _stream_events(self, url: str, headers: Dict, payload: Dict, name: str, params: Dict = None) -> AsyncIterator[Dict]:
+        """POST a streaming request and yield each server-sent event's JSON data"""
+        async for line in self.http.stream_lines(url, headers, payload, name, params):
+            line = line.strip()
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if data and data != "[DONE]":
+                yield orjson.loads(data)
+    
     @abstractmethod
     def validate_config(self, config: Dict) -> bool:
         pass
@@ -26,76 +287,59 @@ class AIProvider(ABC):
 class GeminiProvider(AIProvider):
     """Google Gemini AI provider"""
     
-    def __init__(self, api_key: str, model: str = "gemini-2.5-flash"):
+    def __init__(self, api_key: str, model: str = "gemini-2.5-flash", http: HTTPClient = None):
         self.api_key = api_key
         self.model = model
+        self.http = http or HTTPClient()
         self.base_url = "https://generativelanguage.googleapis.com/v1beta"
+        self._endpoint = f"{self.base_url}/models/{self.model}:generateContent"
+        self._stream_endpoint = f"{self.base_url}/models/{self.model}:streamGenerateContent"
+    
+    def _headers(self) -> Dict:
+        return {
+            "Content-Type": "application/json",
+        }
+    
+    def _build_payload(self, prompt: str, kwargs: Dict) -> Dict:
+        # A shared prefix goes in its own leading part so Gemini's implicit caching can reuse it
+        parts = [{"text": prompt}]
+        if kwargs.get("prefix"):
+            parts.insert(0, {"text": kwargs["prefix"]})
+        return {
+            "contents": [{
+                "parts": parts
+            }],
+            "generationConfig": {
+                "temperature": kwargs.get("temperature", 0.7),
+                "maxOutputTokens": kwargs.get("max_tokens", 2048),
+            }
+        }
     
     async def generate_text(self, prompt: str, **kwargs) -> str:
         """Generate text using Gemini API"""
-        try:
-            url = f"{self.base_url}/models/{self.model}:generateContent"
-            headers = {
-                "Content-Type": "application/json",
-            }
-            
-            payload = {
-                "contents": [{
-                    "parts": [{"text": prompt}]
-                }],
-                "generationConfig": {
-                    "temperature": kwargs.get("temperature", 0.7),
-                    "maxOutputTokens": kwargs.get("max_tokens", 2048),
-                }
-            }
-            
-            response = requests.post(
-                f"{url}?key={self.api_key}",
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result["candidates"][0]["content"]["parts"][0]["text"]
-            else:
-                raise Exception(f"Gemini API error: {response.status_code} - {response.text}")
-        
-        except Exception as e:
-            logger.error(f"Error calling Gemini API: {str(e)}")
-            raise
+        # Pass the key as a query parameter rather than formatting it into the URL
+        result = await self.http.post(
+            self._endpoint,
+            self._headers(),
+            self._build_payload(prompt, kwargs),
+            "Gemini",
+            params={"key": self.api_key}
+        )
+        return result["candidates"][0]["content"]["parts"][0]["text"]
     
-    async def generate_structured_response(self, prompt: str, schema: Dict) -> Dict:
-        """Generate structured response using Gemini API"""
-        try:
-            # Add schema instruction to prompt
-            structured_prompt = f"""
-            {prompt}
-            
-            Please respond with a valid JSON object that matches this schema:
-            {json.dumps(schema, indent=2)}
-            
-            Return only the JSON object, no additional text.
-            """
-            
-            response_text = await self.generate_text(structured_prompt)
-            
-            # Try to parse JSON response
-            try:
-                return json.loads(response_text)
-            except json.JSONDecodeError:
-                # If JSON parsing fails, try to extract JSON from response
-                import re
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    return json.loads(json_match.group())
-                else:
-                    raise Exception("Could not parse structured response as JSON")
-        
-        except Exception as e:
-            logger.error(f"Error generating structured response: {str(e)}")
-            raise
+    async def stream_text(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Stream text from Gemini API as it is generated"""
+        async for event in self._stream_events(
+            self._stream_endpoint,
+            self._headers(),
+            self._build_payload(prompt, kwargs),
+            "Gemini",
+            params={"alt": "sse", "key": self.api_key}
+        ):
+            for candidate in event.get("candidates", [])[:1]:
+                for part in candidate.get("content", {}).get("parts", []):
+                    if part.get("text"):
+                        yield part["text"]
     
     def validate_config(self, config: Dict) -> bool:
         """Validate Gemini configuration"""
@@ -104,66 +348,53 @@ class GeminiProvider(AIProvider):
 class OpenAIProvider(AIProvider):
     """OpenAI API provider"""
     
-    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo"):
+    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo", http: HTTPClient = None):
         self.api_key = api_key
         self.model = model
+        self.http = http or HTTPClient()
         self.base_url = "https://api.openai.com/v1"
+        self._endpoint = f"{self.base_url}/chat/completions"
+    
+    def _headers(self) -> Dict:
+        return {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json",
+        }
+    
+    def _build_payload(self, prompt: str, kwargs: Dict) -> Dict:
+        # OpenAI caches long identical prompt prefixes automatically
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": kwargs.get("prefix", "") + prompt}],
+            "temperature": kwargs.get("temperature", 0.7),
+            "max_tokens": kwargs.get("max_tokens", 2048),
+        }
     
     async def generate_text(self, prompt: str, **kwargs) -> str:
         """Generate text using OpenAI API"""
-        try:
-            url = f"{self.base_url}/chat/completions"
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json",
-            }
-            
-            payload = {
-                "model": self.model,
-                "messages": [{"role": "user", "content": prompt}],
-                "temperature": kwargs.get("temperature", 0.7),
-                "max_tokens": kwargs.get("max_tokens", 2048),
-            }
-            
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
-            else:
-                raise Exception(f"OpenAI API error: {response.status_code} - {response.text}")
-        
-        except Exception as e:
-            logger.error(f"Error calling OpenAI API: {str(e)}")
-            raise
+        result = await self.http.post(
+            self._endpoint,
+            self._headers(),
+            self._build_payload(prompt, kwargs),
+            "OpenAI"
+        )
+        return result["choices"][0]["message"]["content"]
     
-    async def generate_structured_response(self, prompt: str, schema: Dict) -> Dict:
-        """Generate structured response using OpenAI API"""
-        try:
-            structured_prompt = f"""
-            {prompt}
-            
-            Please respond with a valid JSON object that matches this schema:
-            {json.dumps(schema, indent=2)}
-            
-            Return only the JSON object, no additional text.
-            """
-            
-            response_text = await self.generate_text(structured_prompt)
-            
-            try:
-                return json.loads(response_text)
-            except json.JSONDecodeError:
-                import re
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    return json.loads(json_match.group())
-                else:
-                    raise Exception("Could not parse structured response as JSON")
+    async def stream_text(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Stream text from OpenAI API as it is generated"""
+        payload = self._build_payload(prompt, kwargs)
+        payload["stream"] = True
         
-        except Exception as e:
-            logger.error(f"Error generating structured response: {str(e)}")
-            raise
+        async for event in self._stream_events(
+            self._endpoint,
+            self._headers(),
+            payload,
+            "OpenAI"
+        ):
+            for choice in event.get("choices", [])[:1]:
+                text = choice.get("delta", {}).get("content")
+                if text:
+                    yield text
     
     def validate_config(self, config: Dict) -> bool:
         """Validate OpenAI configuration"""
@@ -172,71 +403,91 @@ class OpenAIProvider(AIProvider):
 class AnthropicProvider(AIProvider):
     """Anthropic Claude API provider"""
     
-    def __init__(self, api_key: str, model: str = "claude-3-sonnet-20240229"):
+    def __init__(self, api_key: str, model: str = "claude-3-sonnet-20240229", http: HTTPClient = None):
         self.api_key = api_key
         self.model = model
+        self.http = http or HTTPClient()
         self.base_url = "https://api.anthropic.com/v1"
+        self._endpoint = f"{self.base_url}/messages"
+    
+    def _headers(self) -> Dict:
+        return {
+            "x-api-key": self.api_key,
+            "Content-Type": "application/json",
+            "anthropic-version": "2023-06-01"
+        }
+    
+    def _build_payload(self, prompt: str, kwargs: Dict) -> Dict:
+        content = prompt
+        if kwargs.get("prefix"):
+            # Mark the shared prefix as a prompt-cache breakpoint so later requests reuse it
+            content = [
+                {"type": "text", "text": kwargs["prefix"], "cache_control": {"type": "ephemeral"}},
+                {"type": "text", "text": prompt}
+            ]
+        payload = {
+            "model": self.model,
+            "max_tokens": kwargs.get("max_tokens", 2048),
+            "messages": [{"role": "user", "content": content}]
+        }
+        if "temperature" in kwargs:
+            payload["temperature"] = kwargs["temperature"]
+        return payload
     
     async def generate_text(self, prompt: str, **kwargs) -> str:
         """Generate text using Anthropic API"""
-        try:
-            url = f"{self.base_url}/messages"
-            headers = {
-                "x-api-key": self.api_key,
-                "Content-Type": "application/json",
-                "anthropic-version": "2023-06-01"
-            }
-            
-            payload = {
-                "model": self.model,
-                "max_tokens": kwargs.get("max_tokens", 2048),
-                "messages": [{"role": "user", "content": prompt}]
-            }
-            
-            response = requests.post(url, headers=headers, json=payload, timeout=30)
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result["content"][0]["text"]
-            else:
-                raise Exception(f"Anthropic API error: {response.status_code} - {response.text}")
-        
-        except Exception as e:
-            logger.error(f"Error calling Anthropic API: {str(e)}")
-            raise
+        result = await self.http.post(
+            self._endpoint,
+            self._headers(),
+            self._build_payload(prompt, kwargs),
+            "Anthropic"
+        )
+        return result["content"][0]["text"]
     
-    async def generate_structured_response(self, prompt: str, schema: Dict) -> Dict:
-        """Generate structured response using Anthropic API"""
-        try:
-            structured_prompt = f"""
-            {prompt}
-            
-            Please respond with a valid JSON object that matches this schema:
-            {json.dumps(schema, indent=2)}
-            
-            Return only the JSON object, no additional text.
-            """
-            
-            response_text = await self.generate_text(structured_prompt)
-            
-            try:
-                return json.loads(response_text)
-            except json.JSONDecodeError:
-                import re
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    return json.loads(json_match.group())
-                else:
-                    raise Exception("Could not parse structured response as JSON")
+    async def stream_text(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Stream text from Anthropic API as it is generated"""
+        payload = self._build_payload(prompt, kwargs)
+        payload["stream"] = True
         
-        except Exception as e:
-            logger.error(f"Error generating structured response: {str(e)}")
-            raise
+        async for event in self._stream_events(
+            self._endpoint,
+            self._headers(),
+            payload,
+            "Anthropic"
+        ):
+            if event.get("type") == "content_block_delta":
+                text = event.get("delta", {}).get("text")
+                if text:
+                    yield text
     
     def validate_config(self, config: Dict) -> bool:
         """Validate Anthropic configuration"""
         return bool(config.get("api_key"))
 
+# Static provider metadata, keyed by provider name
+_PROVIDER_META = {
+    "gemini": {
+        "display_name": "Google Gemini",
+        "description": "Google's Gemini AI model",
+        "default_model": "gemini-2.5-flash"
+    },
+    "openai": {
+        "display_name": "OpenAI",
+        "description": "OpenAI's GPT models",
+        "default_model": "gpt-3.5-turbo"
+    },
+    "anthropic": {
+        "display_name": "Anthropic Claude",
+        "description": "Anthropic's Claude models",
+        "default_model": "claude-3-sonnet-20240229"
+    }
+}
+
+# Read-only provider listing, built once and shared by every caller
+_PROVIDERS = tuple(
+    MappingProxyType({"name": name, **meta}) for name, meta in _PROVIDER_META.items()
+)
+
 class AIService:
     """Main AI service that manages different providers"""
     
@@ -248,6 +499,24 @@ class AIService:
         }
         self.current_provider = None
         self.current_instance = None
+        self.settings = {}
+        
+        # Provider instances keyed by (provider, api key hash, model), reused on reconfigure.
+        # Bounded, since every new key or model adds one (holding its key) for good otherwise
+        self._instances: LRUCache = LRUCache(maxsize=8)
+        
+        # Connection pool shared by every provider instance
+        self.http = HTTPClient()
+        
+        # Exact-match response cache for deterministic requests
+        self._cache = TTLCache(maxsize=2048, ttl=3600)
+        self.stats = {"hits": 0, "semantic_hits": 0, "misses": 0, "coalesced": 0}
+        
+        # Similarity cache for paraphrased prompts, enabled via settings["semantic_cache"]
+        self._semantic_cache = None
+        
+        # Requests currently being made, so concurrent duplicates share one call
+        self._inflight: Dict[str, asyncio.Future] = {}
         
         # Load default configuration
         self._load_default_config()
@@ -259,28 +528,9 @@ class AIService:
         if gemini_key:
             self.configure_provider("gemini", gemini_key)
     
-    def get_available_providers(self) -> List[Dict]:
-        """Get list of available AI providers"""
-        return [
-            {
-                "name": "gemini",
-                "display_name": "Google Gemini",
-                "description": "Google's Gemini AI model",
-                "default_model": "gemini-2.5-flash"
-            },
-            {
-                "name": "openai",
-                "display_name": "OpenAI",
-                "description": "OpenAI's GPT models",
-                "default_model": "gpt-3.5-turbo"
-            },
-            {
-                "name": "anthropic",
-                "display_name": "Anthropic Claude",
-                "description": "Anthropic's Claude models",
-                "default_model": "claude-3-sonnet-20240229"
-            }
-        ]
+    def get_available_providers(self) -> Tuple[MappingProxyType, ...]:
+        """Get list of available AI providers (read-only, shared)"""
+        return _PROVIDERS
     
     def configure_provider(self, provider: str, api_key: str, model: str = None, settings: Dict = None) -> bool:
         """Configure AI provider"""
@@ -289,25 +539,35 @@ class AIService:
                 logger.error(f"Unknown provider: {provider}")
                 return False
             
-            # Create provider instance
-            provider_class = self.providers[provider]
-            
             # Set default model if not provided
-            if not model:
-                provider_info = next(p for p in self.get_available_providers() if p["name"] == provider)
-                model = provider_info["default_model"]
+            model = model or _PROVIDER_META[provider]["default_model"]
             
-            # Create instance
-            instance = provider_class(api_key, model)
+            # Reuse the existing instance when only settings changed
+            instance_key = (provider, hashlib.sha256(api_key.encode()).hexdigest(), model)
+            instance = self._instances.get(instance_key)
             
-            # Validate configuration
-            if not instance.validate_config({"api_key": api_key}):
-                logger.error(f"Invalid configuration for provider: {provider}")
-                return False
+            if instance is None:
+                # Create provider instance
+                provider_class = self.providers[provider]
+                instance = provider_class(api_key, model, http=self.http)
+                
+                # Validate configuration
+                if not instance.validate_config({"api_key": api_key}):
+                    logger.error(f"Invalid configuration for provider: {provider}")
+                    return False
+                
+                self._instances[instance_key] = instance
             
             # Set as current provider
             self.current_provider = provider
             self.current_instance = instance
+            self.settings = settings or {}
+            
+            if self.settings.get("semantic_cache") and self._semantic_cache is None:
+                if SemanticCache.is_available():
+                    self._semantic_cache = SemanticCache()
+                else:
+                    logger.warning("Semantic cache requested but sentence-transformers is not installed")
             
             logger.info(f"Configured AI provider: {provider} with model: {model}")
             return True
@@ -320,16 +580,160 @@ class AIService:
         """Get current AI provider name"""
         return self.current_provider or "none"
     
+    def _cache_key(self, prompt: str, kwargs: Dict, schema: Dict = None) -> str:
+        """Build a cache key from the provider, model, prompt and request options"""
+        return hashlib.sha256(orjson.dumps({
+            "p": self.current_provider,
+            "m": self.current_instance.model,
+            "prompt": prompt,
+            "kw": sorted(kwargs.items()),
+            "schema": schema
+        }, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    
+    def _is_cacheable(self, kwargs: Dict) -> bool:
+        """Only deterministic (temperature 0) requests are safe to serve from cache"""
+        return kwargs.get("temperature", 0.7) <= 0.0
+    
+    async def _singleflight(self, key: str, call) -> Any:
+        """Make the request once, letting concurrent identical requests await the same call"""
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(call())
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        else:
+            self.stats["coalesced"] += 1
+        
+        # Shield so one caller disconnecting does not cancel the call for the others,
+        # and copy because callers annotate the returned dicts
+        return copy.deepcopy(await asyncio.shield(future))
+    
+    async def _cached_request(
+        self,
+        prompt: str,
+        kwargs: Dict,
+        schema: Optional[Dict],
+        call,
+        cache: Optional[bool] = None,
+        semantic_text: Optional[str] = None
+    ) -> Any:
+        """Serve a request from the exact or semantic cache, or make it and cache the result
+        
+        cache=True caches even sampled (temperature > 0) requests, cache=False bypasses
+        both caches, and None caches only deterministic requests. The semantic cache is
+        only used when semantic_text names the variable part of the prompt: the rest of
+        the prompt must then match exactly, and only that part is compared by similarity.
+        """
+        exact = self._is_cacheable(kwargs) if cache is None else cache
+        # Whole prompts are mostly template text, so two requests differing only in a
+        # short variable part (such as a candidate's answer) would look alike
+        semantic = None
+        if semantic_text and self.settings.get("semantic_cache") and cache is not False:
+            semantic = self._semantic_cache
+        key = self._cache_key(prompt, kwargs, schema)
+        
+        if exact:
+            if key in self._cache:
+                self.stats["hits"] += 1
+                # Callers annotate returned dicts, so hand out copies
+                return copy.deepcopy(self._cache[key])
+        
+        if semantic is not None:
+            # Only match prompts made with the same provider, model, options, schema
+            # and fixed template text
+            namespace = self._cache_key(prompt.replace(semantic_text, ""), kwargs, schema)
+            vector = await asyncio.to_thread(semantic.embed, semantic_text)
+            cached = semantic.lookup(namespace, vector)
+            if cached is not None:
+                self.stats["semantic_hits"] += 1
+                return copy.deepcopy(cached)
+        
+        if not exact and semantic is None:
+            return await self._singleflight(key, call)
+        
+        self.stats["misses"] += 1
+        result = await self._singleflight(key, call)
+        if exact:
+            self._cache[key] = copy.deepcopy(result)
+        if semantic is not None:
+            semantic.add(namespace, vector, copy.deepcopy(result))
+        return result
+    
     async def generate_text(self, prompt: str, **kwargs) -> str:
         """Generate text using current provider"""
         if not self.current_instance:
             raise Exception("No AI provider configured")
         
-        return await self.current_instance.generate_text(prompt, **kwargs)
+        return await self._cached_request(
+            prompt, kwargs, None,
+            lambda: self.current_instance.generate_text(prompt, **kwargs)
+        )
+    
+    async def generate_structured_response(
+        self,
+        prompt: str,
+        schema: Dict,
+        validator=None,
+        cache: Optional[bool] = None,
+        semantic_text: Optional[str] = None,
+        prefix: Optional[str] = None,
+        **kwargs
+    ) -> Dict:
+        """Generate structured response using current provider
+        
+        Pass a precompiled jsonschema validator for the schema to reject malformed
+        responses before they are cached or returned, cache to override the default
+        temperature-based caching decision, and semantic_text to let the semantic
+        cache compare only that variable part of the prompt. A prefix is sent ahead
+        of the prompt as a separate segment that providers can cache across calls
+        sharing it.
+        """
+        if not self.current_instance:
+            raise Exception("No AI provider configured")
+        
+        provider_kwargs = dict(kwargs, prefix=prefix) if prefix else kwargs
+        
+        async def call() -> Dict:
+            response = await self.current_instance.generate_structured_response(prompt, schema, **provider_kwargs)
+            if validator is not None and not validator.is_valid(response):
+                raise ValueError("Structured response does not match the schema")
+            return response
+        
+        return await self._cached_request((prefix or "") + prompt, kwargs, schema, call, cache, semantic_text)
+    
+    async def generate_text_batch(self, prompts: List[str], **kwargs) -> List[str]:
+        """Generate text for independent prompts concurrently"""
+        # Bound fan-out so large batches stay within provider rate limits
+        semaphore = asyncio.Semaphore(10)
+        
+        async def generate(prompt: str) -> str:
+            async with semaphore:
+                return await self.generate_text(prompt, **kwargs)
+        
+        return await asyncio.gather(*(generate(p) for p in prompts))
+    
+    async def generate_structured_response_stream(
+        self, prompt: str, schema: Dict, **kwargs
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Stream a structured response, yielding each top-level field once it is complete"""
+        if not self.current_instance:
+            raise Exception("No AI provider configured")
+        
+        parser = _JSONFieldParser()
+        parsed_any = False
+        structured_prompt = self.current_instance._build_structured_prompt(prompt, schema)
+        async for chunk in self.current_instance.stream_text(structured_prompt, **kwargs):
+            for field in parser.feed(chunk):
+                parsed_any = True
+                yield field
+        
+        if not parsed_any:
+            raise ValueError("Could not parse structured response as JSON")
     
-    async def generate_structured_response(self, prompt: str, schema: Dict) -> Dict:
-        """Generate structured response using current provider"""
+    async def stream_text(self, prompt: str, **kwargs) -> AsyncIterator[str]:
+        """Stream text from the current provider as it is generated"""
         if not self.current_instance:
             raise Exception("No AI provider configured")
         
-        return await self.current_instance.generate_structured_response(prompt, schema)
+        async for chunk in self.current_instance.stream_text(prompt, **kwargs):
+            yield chunk
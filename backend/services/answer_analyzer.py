@@ -1,15 +1,96 @@
 import asyncio
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, AsyncIterator, Tuple
 import logging
 import re
+from jsonschema import Draft7Validator
+
+from .ai_service import ProviderError
 
 logger = logging.getLogger(__name__)
 
+# Response schema and its validator, compiled once at import
+_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "overall_rating": {
+            "type": "number",
+            "minimum": 1,
+            "maximum": 10
+        },
+        "detailed_scores": {
+            "type": "object",
+            "properties": {
+                "relevance": {"type": "number", "minimum": 1, "maximum": 10},
+                "completeness": {"type": "number", "minimum": 1, "maximum": 10},
+                "clarity": {"type": "number", "minimum": 1, "maximum": 10},
+                "specificity": {"type": "number", "minimum": 1, "maximum": 10},
+                "professionalism": {"type": "number", "minimum": 1, "maximum": 10}
+            }
+        },
+        "strengths": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "weaknesses": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "suggestions": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "key_points": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "sentiment": {
+            "type": "string",
+            "enum": ["positive", "neutral", "negative"]
+        },
+        "confidence_level": {
+            "type": "string",
+            "enum": ["high", "medium", "low"]
+        },
+        "feedback": {"type": "string"}
+    },
+    "required": ["overall_rating", "detailed_scores", "strengths", "weaknesses", "suggestions"]
+}
+_ANALYSIS_VALIDATOR = Draft7Validator(_ANALYSIS_SCHEMA)
+
+# Patterns for answer complexity; the technical terms match against lowercased text
+_SENTENCE_SPLIT_RE = re.compile(r'[.!?]+')
+_TECH_TERMS_RE = re.compile(r'\b(api|database|algorithm|framework|architecture|implementation|optimization|scalability|security|performance)\b')
+
+# Question type keywords scanned in one pass. The lookahead tests every position so
+# overlapping keywords are all seen; when several types match, the earlier one wins.
+_QUESTION_TYPE_PRIORITY = ("behavioral", "technical", "motivational", "self_assessment")
+_Q_TYPE_RE = re.compile(
+    r'(?=(?P<behavioral>tell me about|describe|explain|walk me through)'
+    r'|(?P<technical>how would you|what would you|design|implement|solve)'
+    r'|(?P<motivational>why|motivation|interest|passion)'
+    r'|(?P<self_assessment>strengths|weaknesses|skills|abilities))'
+)
+
+# Single-word indicators for the fallback heuristics, matched against the answer's tokens
+_WORD_RE = re.compile(r'[a-z]+')
+_EXAMPLE_INDICATORS = frozenset({"example", "examples", "instance", "specifically", "when"})
+_TECH_INDICATORS = frozenset({
+    "api", "apis", "database", "databases", "system", "systems",
+    "process", "processes", "method", "methods"
+})
+
+# Answers longer than this (in characters) run their heuristics in a worker thread
+_OFFLOAD_CHARS = 4000
+
 class AnswerAnalyzer:
     """Analyze and rate interview answers using AI"""
     
-    def __init__(self, ai_service):
+    __slots__ = ("ai_service", "cache_responses")
+    
+    def __init__(self, ai_service, cache_responses: bool = True):
         self.ai_service = ai_service
+        # Re-analyzing an identical answer reuses the earlier result; disable for fresh sampling
+        self.cache_responses = cache_responses
     
     async def analyze_answer(
         self, 
@@ -22,74 +103,134 @@ class AnswerAnalyzer:
         if context is None:
             context = {}
         
+        # Tokenize once and share the count with every heuristic below
+        word_count = len(answer.split())
+        
+        # Nothing to send to the model for an empty answer
+        if word_count == 0:
+            return self._get_empty_answer_analysis(question, answer)
+        
         try:
             # Create analysis prompt
             prompt = self._create_analysis_prompt(question, answer, context)
             
-            # Define response schema
-            schema = {
-                "type": "object",
-                "properties": {
-                    "overall_rating": {
-                        "type": "number",
-                        "minimum": 1,
-                        "maximum": 10
-                    },
-                    "detailed_scores": {
-                        "type": "object",
-                        "properties": {
-                            "relevance": {"type": "number", "minimum": 1, "maximum": 10},
-                            "completeness": {"type": "number", "minimum": 1, "maximum": 10},
-                            "clarity": {"type": "number", "minimum": 1, "maximum": 10},
-                            "specificity": {"type": "number", "minimum": 1, "maximum": 10},
-                            "professionalism": {"type": "number", "minimum": 1, "maximum": 10}
-                        }
-                    },
-                    "strengths": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "weaknesses": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "suggestions": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "key_points": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "sentiment": {
-                        "type": "string",
-                        "enum": ["positive", "neutral", "negative"]
-                    },
-                    "confidence_level": {
-                        "type": "string",
-                        "enum": ["high", "medium", "low"]
-                    }
-                },
-                "required": ["overall_rating", "detailed_scores", "strengths", "weaknesses", "suggestions"]
-            }
-            
             # Generate analysis using AI
-            response = await self.ai_service.generate_structured_response(prompt, schema)
+            response = await self.ai_service.generate_structured_response(
+                prompt, _ANALYSIS_SCHEMA, validator=_ANALYSIS_VALIDATOR, cache=self.cache_responses,
+                semantic_text=answer
+            )
             
             # Add additional analysis
-            response["analysis_metadata"] = {
-                "answer_length": len(answer.split()),
-                "answer_duration_estimate": self._estimate_speech_duration(answer),
-                "question_type": self._classify_question_type(question),
-                "answer_complexity": self._assess_answer_complexity(answer)
-            }
+            response["analysis_metadata"] = await self._run_heuristics(
+                answer, self._compute_metadata, question, answer, word_count
+            )
             
             return response
             
+        except ProviderError:
+            raise
         except Exception as e:
             logger.error(f"Error analyzing answer: {str(e)}")
             # Return fallback analysis
-            return self._get_fallback_analysis(question, answer)
+            return await self._run_heuristics(
+                answer, self._get_fallback_analysis, question, answer, word_count
+            )
+    
+    async def analyze_answer_stream(
+        self,
+        question: str,
+        answer: str,
+        context: Dict = None
+    ) -> AsyncIterator[Dict]:
+        """Analyze an answer, yielding each analysis field as soon as the model completes it"""
+        
+        if context is None:
+            context = {}
+        
+        word_count = len(answer.split())
+        emitted = set()
+        
+        if word_count == 0:
+            for key, value in self._get_empty_answer_analysis(question, answer).items():
+                yield {key: value}
+            return
+        
+        try:
+            prompt = self._create_analysis_prompt(question, answer, context)
+            
+            async for key, value in self.ai_service.generate_structured_response_stream(prompt, _ANALYSIS_SCHEMA):
+                emitted.add(key)
+                yield {key: value}
+            
+            if not emitted.issuperset(_ANALYSIS_SCHEMA["required"]):
+                raise ValueError("Streamed analysis is missing required fields")
+            
+            yield {"analysis_metadata": await self._run_heuristics(
+                answer, self._compute_metadata, question, answer, word_count
+            )}
+            
+        except ProviderError:
+            raise
+        except Exception as e:
+            logger.error(f"Error streaming answer analysis: {str(e)}")
+            # Complete the analysis with fallback values for the fields not yet sent
+            fallback = await self._run_heuristics(
+                answer, self._get_fallback_analysis, question, answer, word_count
+            )
+            for key, value in fallback.items():
+                if key not in emitted:
+                    yield {key: value}
+    
+    async def analyze_answers(self, items: List[Tuple[str, str, Dict]]) -> List[Dict]:
+        """Analyze independent (question, answer, context) items concurrently, in input order"""
+        # Bound fan-out so large batches stay within provider rate limits; each item falls
+        # back on its own if its analysis fails, but a provider error fails the batch
+        semaphore = asyncio.Semaphore(10)
+        
+        async def analyze(question: str, answer: str, context: Dict) -> Dict:
+            async with semaphore:
+                return await self.analyze_answer(question, answer, context)
+        
+        tasks = [asyncio.create_task(analyze(*item)) for item in items]
+        try:
+            return await asyncio.gather(*tasks)
+        finally:
+            # Don't keep calling a provider that is already failing
+            for task in tasks:
+                task.cancel()
+    
+    async def analyze_answers_stream(self, items: List[Tuple[str, str, Dict]]) -> AsyncIterator[Tuple[int, Dict]]:
+        """Yield (index, analysis) pairs as each analysis finishes, fastest first"""
+        semaphore = asyncio.Semaphore(10)
+        
+        async def analyze(index: int, question: str, answer: str, context: Dict) -> Tuple[int, Dict]:
+            async with semaphore:
+                return index, await self.analyze_answer(question, answer, context)
+        
+        tasks = [asyncio.create_task(analyze(i, *item)) for i, item in enumerate(items)]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Stop outstanding analyses if the consumer goes away early
+            for task in tasks:
+                task.cancel()
+    
+    async def _run_heuristics(self, answer: str, func, *args) -> Any:
+        """Run sync heuristics inline for typical answers, off the event loop for long transcripts"""
+        # Below this size the regex passes are cheaper than a thread hop
+        if len(answer) < _OFFLOAD_CHARS:
+            return func(*args)
+        return await asyncio.to_thread(func, *args)
+    
+    def _compute_metadata(self, question: str, answer: str, word_count: int) -> Dict:
+        """Compute the heuristic metadata attached to every analysis"""
+        return {
+            "answer_length": word_count,
+            "answer_duration_estimate": self._estimate_speech_duration(answer, word_count),
+            "question_type": self._classify_question_type(question),
+            "answer_complexity": self._assess_answer_complexity(answer, word_count)
+        }
     
     def _create_analysis_prompt(self, question: str, answer: str, context: Dict) -> str:
         """Create prompt for answer analysis"""
@@ -129,41 +270,44 @@ class AnswerAnalyzer:
         - Key points the candidate made
         - Overall sentiment (positive/neutral/negative)
         - Confidence level in the response (high/medium/low)
+        - Feedback: 2-3 paragraphs of constructive feedback addressed to the candidate that
+          acknowledges strengths, gives specific improvement suggestions, and encourages them
         
         Be constructive and specific in your feedback. Focus on actionable insights.
         """
         
         return prompt
     
-    def _estimate_speech_duration(self, text: str) -> int:
+    def _estimate_speech_duration(self, text: str, word_count: Optional[int] = None) -> int:
         """Estimate speech duration in seconds based on text length"""
         # Average speaking rate is about 150-160 words per minute
-        words = len(text.split())
+        words = len(text.split()) if word_count is None else word_count
+        if words == 0:
+            return 0
         return max(1, int((words / 150) * 60))
     
     def _classify_question_type(self, question: str) -> str:
         """Classify the type of question"""
-        question_lower = question.lower()
-        
-        if any(word in question_lower for word in ["tell me about", "describe", "explain", "walk me through"]):
-            return "behavioral"
-        elif any(word in question_lower for word in ["how would you", "what would you", "design", "implement", "solve"]):
-            return "technical"
-        elif any(word in question_lower for word in ["why", "motivation", "interest", "passion"]):
-            return "motivational"
-        elif any(word in question_lower for word in ["strengths", "weaknesses", "skills", "abilities"]):
-            return "self-assessment"
-        else:
-            return "general"
+        matched = {match.lastgroup for match in _Q_TYPE_RE.finditer(question.lower())}
+        
+        for question_type in _QUESTION_TYPE_PRIORITY:
+            if question_type in matched:
+                return question_type.replace("_", "-")
+        return "general"
     
-    def _assess_answer_complexity(self, answer: str) -> str:
+    def _assess_answer_complexity(self, answer: str, word_count: Optional[int] = None) -> str:
         """Assess the complexity level of the answer"""
-        word_count = len(answer.split())
-        sentence_count = len(re.split(r'[.!?]+', answer))
+        # Too short to reach the medium thresholds (over 50 words)
+        if len(answer) < 50:
+            return "low"
+        
+        if word_count is None:
+            word_count = len(answer.split())
+        sentence_count = len(_SENTENCE_SPLIT_RE.split(answer))
         avg_sentence_length = word_count / max(sentence_count, 1)
         
         # Check for technical terms
-        technical_terms = len(re.findall(r'\b(API|database|algorithm|framework|architecture|implementation|optimization|scalability|security|performance)\b', answer, re.IGNORECASE))
+        technical_terms = len(_TECH_TERMS_RE.findall(answer.lower()))
         
         if word_count > 100 and avg_sentence_length > 15 and technical_terms > 2:
             return "high"
@@ -172,11 +316,15 @@ class AnswerAnalyzer:
         else:
             return "low"
     
-    def _get_fallback_analysis(self, question: str, answer: str) -> Dict:
+    def _get_fallback_analysis(self, question: str, answer: str, word_count: Optional[int] = None) -> Dict:
         """Fallback analysis when AI generation fails"""
         
         # Simple heuristic-based analysis
-        word_count = len(answer.split())
+        if word_count is None:
+            word_count = len(answer.split())
+        
+        if word_count == 0:
+            return self._get_empty_answer_analysis(question, answer)
         
         # Basic scoring based on length and content
         if word_count < 10:
@@ -197,14 +345,15 @@ class AnswerAnalyzer:
             clarity = 8
         
         # Check for specific indicators
-        has_example = any(word in answer.lower() for word in ["example", "for instance", "specifically", "when"])
-        has_technical_terms = any(word in answer.lower() for word in ["api", "database", "system", "process", "method"])
+        tokens = set(_WORD_RE.findall(answer.lower()))
+        has_example = not tokens.isdisjoint(_EXAMPLE_INDICATORS)
+        has_technical_terms = not tokens.isdisjoint(_TECH_INDICATORS)
         
         relevance = 7 if has_example else 5
         specificity = 8 if has_technical_terms else 6
         professionalism = 8 if len(answer) > 50 else 6
         
-        return {
+        analysis = {
             "overall_rating": overall_rating,
             "detailed_scores": {
                 "relevance": relevance,
@@ -226,20 +375,52 @@ class AnswerAnalyzer:
                 "Elaborate on your experience and achievements",
                 "Use the STAR method (Situation, Task, Action, Result) for behavioral questions"
             ],
-            "key_points": answer.split()[:10],  # First 10 words as key points
+            "key_points": answer.split(maxsplit=10)[:10],  # First 10 words as key points
             "sentiment": "positive" if overall_rating >= 7 else "neutral" if overall_rating >= 5 else "negative",
             "confidence_level": "high" if overall_rating >= 8 else "medium" if overall_rating >= 6 else "low",
+            "analysis_metadata": self._compute_metadata(question, answer, word_count)
+        }
+        analysis["feedback"] = self._get_fallback_feedback(analysis)
+        
+        return analysis
+    
+    def _get_empty_answer_analysis(self, question: str, answer: str) -> Dict:
+        """Canned analysis for an answer with no words"""
+        return {
+            "overall_rating": 1,
+            "detailed_scores": {
+                "relevance": 1,
+                "completeness": 1,
+                "clarity": 1,
+                "specificity": 1,
+                "professionalism": 1
+            },
+            "strengths": [],
+            "weaknesses": ["No answer was given"],
+            "suggestions": [
+                "Answer the question directly, even briefly",
+                "Use the STAR method (Situation, Task, Action, Result) for behavioral questions"
+            ],
+            "key_points": [],
+            "sentiment": "neutral",
+            "confidence_level": "low",
             "analysis_metadata": {
-                "answer_length": word_count,
-                "answer_duration_estimate": self._estimate_speech_duration(answer),
+                "answer_length": 0,
+                "answer_duration_estimate": 0,
                 "question_type": self._classify_question_type(question),
-                "answer_complexity": self._assess_answer_complexity(answer)
-            }
+                "answer_complexity": "low"
+            },
+            "feedback": "No answer was recorded for this question. Take a moment to gather your thoughts "
+                        "and respond, even briefly; a short, direct answer is better than none."
         }
     
     async def generate_feedback(self, analysis: Dict) -> str:
         """Generate human-readable feedback from analysis"""
         
+        # analyze_answer asks for feedback in the same call, so usually no second request is needed
+        if analysis.get("feedback"):
+            return analysis["feedback"]
+        
         try:
             prompt = f"""
             Based on this interview answer analysis, generate constructive feedback for the candidate:
@@ -261,6 +442,8 @@ class AnswerAnalyzer:
             feedback = await self.ai_service.generate_text(prompt)
             return feedback
             
+        except ProviderError:
+            raise
         except Exception as e:
             logger.error(f"Error generating feedback: {str(e)}")
             return self._get_fallback_feedback(analysis)
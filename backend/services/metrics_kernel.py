@@ -0,0 +1,73 @@
+from typing import Tuple
+import logging
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+logger = logging.getLogger(__name__)
+
+def _reduce_loop(values: np.ndarray) -> Tuple[float, float, int, int, int, int]:
+    """Mean, variance, max/min positions and excellent/poor counts in fused passes"""
+    n = values.shape[0]
+    total = 0.0
+    max_index = 0
+    min_index = 0
+    excellent = 0
+    poor = 0
+    for i in range(n):
+        value = values[i]
+        total += value
+        if value > values[max_index]:
+            max_index = i
+        if value < values[min_index]:
+            min_index = i
+        if value >= 8:
+            excellent += 1
+        elif value < 6:
+            poor += 1
+    
+    # Second pass over the mean keeps the variance as accurate as NumPy's
+    mean = total / n
+    squares = 0.0
+    for i in range(n):
+        delta = values[i] - mean
+        squares += delta * delta
+    
+    return mean, squares / n, max_index, min_index, excellent, poor
+
+def _reduce_numpy(values: np.ndarray) -> Tuple[float, float, int, int, int, int]:
+    """NumPy equivalent of the compiled kernel, used when Numba is not installed"""
+    return (
+        float(values.mean()),
+        float(values.var()),
+        int(values.argmax()),
+        int(values.argmin()),
+        int(np.count_nonzero(values >= 8)),
+        int(np.count_nonzero(values < 6))
+    )
+
+# cache=True persists the compiled kernel next to this module so restarts skip the JIT
+_reduce = njit(cache=True)(_reduce_loop) if njit is not None else _reduce_numpy
+
+def is_compiled() -> bool:
+    """Check whether the Numba-compiled kernel is in use"""
+    return njit is not None
+
+def reduce_ratings(ratings) -> Tuple[float, float, int, int, int, int]:
+    """Reduce a non-empty ratings sequence in one call
+    
+    Returns (mean, variance, max_index, min_index, excellent_count, poor_count)
+    as plain Python numbers.
+    """
+    mean, variance, max_index, min_index, excellent, poor = _reduce(np.asarray(ratings, dtype=np.float64))
+    return float(mean), float(variance), int(max_index), int(min_index), int(excellent), int(poor)
+
+def warm_up():
+    """Compile (or load the cached) kernel so the first report doesn't pay for it"""
+    if is_compiled():
+        logger.info("Compiling metrics kernel")
+        reduce_ratings([0.0])
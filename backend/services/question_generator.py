@@ -1,14 +1,240 @@
 import asyncio
-from typing import Dict, List, Optional, Any
+import copy
+import functools
+from types import MappingProxyType
+from typing import Dict, List, Optional, Any, Tuple
 import logging
+from jsonschema import Draft7Validator
+
+from .ai_service import ProviderError
 
 logger = logging.getLogger(__name__)
 
+# Response schemas and their validators, compiled once at import
+_QUESTIONS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "questions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "question": {"type": "string"},
+                    "category": {"type": "string"},
+                    "difficulty": {"type": "string", "enum": ["easy", "medium", "hard"]},
+                    "purpose": {"type": "string"},
+                    "follow_up_suggestions": {
+                        "type": "array",
+                        "items": {"type": "string"}
+                    }
+                },
+                "required": ["question", "category", "difficulty", "purpose"]
+            }
+        }
+    },
+    "required": ["questions"]
+}
+
+_FOLLOWUP_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "followup_questions": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "question": {"type": "string"},
+                    "relevance": {"type": "string"},
+                    "purpose": {"type": "string"}
+                },
+                "required": ["question", "relevance", "purpose"]
+            }
+        }
+    },
+    "required": ["followup_questions"]
+}
+
+_QUESTIONS_VALIDATOR = Draft7Validator(_QUESTIONS_SCHEMA)
+_FOLLOWUP_VALIDATOR = Draft7Validator(_FOLLOWUP_SCHEMA)
+
+# Previous questions included in the prompt; older ones are dropped
+_MAX_PREVIOUS_QUESTIONS = 10
+
+# Question type specific instructions
+_TYPE_INSTRUCTIONS = MappingProxyType({
+    "technical": """
+            Focus on technical skills, problem-solving abilities, and hands-on experience.
+            Include questions about specific technologies, coding challenges, and technical decision-making.
+            """,
+    "behavioral": """
+            Focus on past experiences, soft skills, and how the candidate handles various situations.
+            Use the STAR method (Situation, Task, Action, Result) format.
+            """,
+    "leadership": """
+            Focus on leadership experience, team management, decision-making, and vision.
+            Include questions about conflict resolution, team building, and strategic thinking.
+            """,
+    "general": """
+            Mix of technical, behavioral, and situational questions.
+            Cover various aspects of the role and company culture fit.
+            """,
+    "culture_fit": """
+            Focus on values alignment, work style, motivation, and team collaboration.
+            Include questions about company culture, work environment preferences, and long-term goals.
+            """
+})
+
+# Canned questions used when AI generation fails, handed out as copies
+_FALLBACK_QUESTIONS = MappingProxyType({
+    "technical": [
+        {
+            "question": "Can you walk me through your approach to solving a complex technical problem?",
+            "category": "Technical",
+            "difficulty": "medium",
+            "purpose": "Assess problem-solving methodology",
+            "follow_up_suggestions": [
+                "What specific tools or technologies did you use?",
+                "How did you handle unexpected challenges?"
+            ]
+        },
+        {
+            "question": "Describe a time when you had to learn a new technology quickly. How did you approach it?",
+            "category": "Technical",
+            "difficulty": "easy",
+            "purpose": "Evaluate learning agility",
+            "follow_up_suggestions": [
+                "What resources did you use?",
+                "How did you ensure quality while learning quickly?"
+            ]
+        }
+    ],
+    "behavioral": [
+        {
+            "question": "Tell me about a time when you had to work with a difficult team member. How did you handle it?",
+            "category": "Behavioral",
+            "difficulty": "medium",
+            "purpose": "Assess conflict resolution skills",
+            "follow_up_suggestions": [
+                "What was the outcome?",
+                "What did you learn from this experience?"
+            ]
+        },
+        {
+            "question": "Describe a situation where you had to meet a tight deadline. How did you manage it?",
+            "category": "Behavioral",
+            "difficulty": "easy",
+            "purpose": "Evaluate time management and stress handling",
+            "follow_up_suggestions": [
+                "What strategies did you use?",
+                "How did you ensure quality wasn't compromised?"
+            ]
+        }
+    ],
+    "general": [
+        {
+            "question": "Tell me about yourself and your professional background.",
+            "category": "General",
+            "difficulty": "easy",
+            "purpose": "Get overview of candidate's experience",
+            "follow_up_suggestions": [
+                "What aspects of your background are most relevant to this role?",
+                "What are you most proud of in your career?"
+            ]
+        },
+        {
+            "question": "Why are you interested in this position and our company?",
+            "category": "General",
+            "difficulty": "easy",
+            "purpose": "Assess motivation and company research",
+            "follow_up_suggestions": [
+                "What specific aspects of our company culture appeal to you?",
+                "How do you see yourself contributing to our team?"
+            ]
+        }
+    ]
+})
+
+_FALLBACK_FOLLOWUP_QUESTIONS = [
+    {
+        "question": "Can you provide a specific example of that?",
+        "relevance": "Asks for concrete evidence",
+        "purpose": "Verify claims with specific details"
+    },
+    {
+        "question": "What challenges did you face in that situation?",
+        "relevance": "Explores problem-solving approach",
+        "purpose": "Understand how candidate handles obstacles"
+    },
+    {
+        "question": "What would you do differently if you faced that situation again?",
+        "relevance": "Tests learning and self-reflection",
+        "purpose": "Assess growth mindset and continuous improvement"
+    }
+]
+
+def _as_text(value: Any) -> Optional[str]:
+    """Coerce an optional prompt value to a string, keeping empty values as None"""
+    return str(value) if value else None
+
+@functools.lru_cache(maxsize=256)
+def _question_prompt_head(
+    question_type: str,
+    count: str,
+    context: Optional[str],
+    role: Optional[str],
+    experience_level: Optional[str],
+    skills: Optional[Tuple[str, ...]]
+) -> str:
+    """Build the session-constant opening of the question prompt"""
+    base_prompt = f"""
+        You are an expert interviewer conducting a {question_type} interview. 
+        Generate {count} high-quality interview questions.
+        """
+    
+    # Add context if provided
+    if context:
+        base_prompt += f"\n\nInterview Context: {context}"
+    
+    # Add candidate information if provided
+    candidate_details = []
+    if role:
+        candidate_details.append(f"Role: {role}")
+    if experience_level:
+        candidate_details.append(f"Experience Level: {experience_level}")
+    if skills:
+        candidate_details.append(f"Skills: {', '.join(skills)}")
+    
+    if candidate_details:
+        base_prompt += f"\n\nCandidate Information:\n" + "\n".join(candidate_details)
+    
+    return base_prompt
+
+@functools.lru_cache(maxsize=32)
+def _question_prompt_tail(question_type: str) -> str:
+    """Build the type instructions and output format that close the question prompt"""
+    return _TYPE_INSTRUCTIONS.get(question_type, _TYPE_INSTRUCTIONS["general"]) + """
+        
+        For each question, provide:
+        1. The question text
+        2. Category (e.g., "Technical", "Behavioral", "Leadership", "Problem-solving")
+        3. Difficulty level (easy, medium, hard)
+        4. Purpose of the question
+        5. 2-3 follow-up question suggestions
+        
+        Make questions specific, relevant, and designed to reveal the candidate's true capabilities.
+        Avoid yes/no questions and generic questions.
+        """
+
 class QuestionGenerator:
     """Generate interview questions using AI"""
     
-    def __init__(self, ai_service):
+    __slots__ = ("ai_service", "cache_responses")
+    
+    def __init__(self, ai_service, cache_responses: bool = True):
         self.ai_service = ai_service
+        # Follow-ups for an identical Q&A reuse the earlier result; disable for fresh sampling.
+        # Question suggestions are always sampled fresh since users ask again for new ones.
+        self.cache_responses = cache_responses
     
     async def generate_questions(
         self, 
@@ -32,41 +258,42 @@ class QuestionGenerator:
                 context, question_type, count, previous_questions, candidate_info
             )
             
-            # Define response schema
-            schema = {
-                "type": "object",
-                "properties": {
-                    "questions": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "question": {"type": "string"},
-                                "category": {"type": "string"},
-                                "difficulty": {"type": "string", "enum": ["easy", "medium", "hard"]},
-                                "purpose": {"type": "string"},
-                                "follow_up_suggestions": {
-                                    "type": "array",
-                                    "items": {"type": "string"}
-                                }
-                            },
-                            "required": ["question", "category", "difficulty", "purpose"]
-                        }
-                    }
-                },
-                "required": ["questions"]
-            }
-            
             # Generate questions using AI
-            response = await self.ai_service.generate_structured_response(prompt, schema)
+            # Never cached, so asking again (even with a paraphrased context) samples new questions
+            response = await self.ai_service.generate_structured_response(
+                prompt, _QUESTIONS_SCHEMA, validator=_QUESTIONS_VALIDATOR, cache=False
+            )
             
             return response.get("questions", [])
             
+        except ProviderError:
+            raise
         except Exception as e:
             logger.error(f"Error generating questions: {str(e)}")
             # Return fallback questions
             return self._get_fallback_questions(question_type, count)
     
+    async def generate_questions_for_types(
+        self,
+        question_types: List[str],
+        context: str = "",
+        count: int = 5,
+        previous_questions: List[str] = None,
+        candidate_info: Dict = None
+    ) -> Dict[str, List[Dict]]:
+        """Generate questions for several question types concurrently, keyed by type"""
+        results = await asyncio.gather(*(
+            self.generate_questions(
+                context=context,
+                question_type=question_type,
+                count=count,
+                previous_questions=previous_questions,
+                candidate_info=candidate_info
+            )
+            for question_type in question_types
+        ))
+        return dict(zip(question_types, results))
+    
     def _create_question_prompt(
         self, 
         context: str, 
@@ -77,74 +304,33 @@ class QuestionGenerator:
     ) -> str:
         """Create prompt for question generation"""
         
-        base_prompt = f"""
-        You are an expert interviewer conducting a {question_type} interview. 
-        Generate {count} high-quality interview questions.
-        """
-        
-        # Add context if provided
-        if context:
-            base_prompt += f"\n\nInterview Context: {context}"
-        
-        # Add candidate information if provided
-        if candidate_info:
-            candidate_details = []
-            if candidate_info.get("role"):
-                candidate_details.append(f"Role: {candidate_info['role']}")
-            if candidate_info.get("experience_level"):
-                candidate_details.append(f"Experience Level: {candidate_info['experience_level']}")
-            if candidate_info.get("skills"):
-                candidate_details.append(f"Skills: {', '.join(candidate_info['skills'])}")
-            
-            if candidate_details:
-                base_prompt += f"\n\nCandidate Information:\n" + "\n".join(candidate_details)
-        
-        # Add previous questions to avoid repetition
-        if previous_questions:
-            base_prompt += f"\n\nPrevious questions asked (avoid repetition):\n"
-            for i, q in enumerate(previous_questions, 1):
-                base_prompt += f"{i}. {q}\n"
-        
-        # Add question type specific instructions
-        type_instructions = {
-            "technical": """
-            Focus on technical skills, problem-solving abilities, and hands-on experience.
-            Include questions about specific technologies, coding challenges, and technical decision-making.
-            """,
-            "behavioral": """
-            Focus on past experiences, soft skills, and how the candidate handles various situations.
-            Use the STAR method (Situation, Task, Action, Result) format.
-            """,
-            "leadership": """
-            Focus on leadership experience, team management, decision-making, and vision.
-            Include questions about conflict resolution, team building, and strategic thinking.
-            """,
-            "general": """
-            Mix of technical, behavioral, and situational questions.
-            Cover various aspects of the role and company culture fit.
-            """,
-            "culture_fit": """
-            Focus on values alignment, work style, motivation, and team collaboration.
-            Include questions about company culture, work environment preferences, and long-term goals.
-            """
-        }
-        
-        base_prompt += type_instructions.get(question_type, type_instructions["general"])
+        # Request JSON may hold lists or objects here, which the prompt caches cannot hash
+        skills = candidate_info.get("skills")
+        if isinstance(skills, (list, tuple)):
+            skills = tuple(str(skill) for skill in skills)
+        elif skills:
+            skills = (str(skills),)
         
-        base_prompt += f"""
+        # The head and tail stay the same across a session; only the previous questions grow
+        parts = [_question_prompt_head(
+            str(question_type),
+            str(count),
+            _as_text(context),
+            _as_text(candidate_info.get("role")),
+            _as_text(candidate_info.get("experience_level")),
+            skills or None
+        )]
         
-        For each question, provide:
-        1. The question text
-        2. Category (e.g., "Technical", "Behavioral", "Leadership", "Problem-solving")
-        3. Difficulty level (easy, medium, hard)
-        4. Purpose of the question
-        5. 2-3 follow-up question suggestions
+        # Add the most recent distinct previous questions to avoid repetition,
+        # bounded so the prompt does not grow with the length of the interview
+        recent_questions = list(dict.fromkeys(previous_questions))[-_MAX_PREVIOUS_QUESTIONS:]
+        if recent_questions:
+            parts.append("\n\nPrevious questions asked (avoid repetition):\n")
+            parts.extend(f"{i}. {q}\n" for i, q in enumerate(recent_questions, 1))
         
-        Make questions specific, relevant, and designed to reveal the candidate's true capabilities.
-        Avoid yes/no questions and generic questions.
-        """
+        parts.append(_question_prompt_tail(str(question_type)))
         
-        return base_prompt
+        return "".join(parts)
     
     async def generate_followup_questions(
         self, 
@@ -186,28 +372,14 @@ class QuestionGenerator:
             - What insight it aims to reveal
             """
             
-            schema = {
-                "type": "object",
-                "properties": {
-                    "followup_questions": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "question": {"type": "string"},
-                                "relevance": {"type": "string"},
-                                "purpose": {"type": "string"}
-                            },
-                            "required": ["question", "relevance", "purpose"]
-                        }
-                    }
-                },
-                "required": ["followup_questions"]
-            }
-            
-            response = await self.ai_service.generate_structured_response(prompt, schema)
+            response = await self.ai_service.generate_structured_response(
+                prompt, _FOLLOWUP_SCHEMA, validator=_FOLLOWUP_VALIDATOR, cache=self.cache_responses,
+                semantic_text=answer
+            )
             return response.get("followup_questions", [])
             
+        except ProviderError:
+            raise
         except Exception as e:
             logger.error(f"Error generating follow-up questions: {str(e)}")
             return self._get_fallback_followup_questions()
@@ -215,94 +387,10 @@ class QuestionGenerator:
     def _get_fallback_questions(self, question_type: str, count: int) -> List[Dict]:
         """Fallback questions when AI generation fails"""
         
-        fallback_questions = {
-            "technical": [
-                {
-                    "question": "Can you walk me through your approach to solving a complex technical problem?",
-                    "category": "Technical",
-                    "difficulty": "medium",
-                    "purpose": "Assess problem-solving methodology",
-                    "follow_up_suggestions": [
-                        "What specific tools or technologies did you use?",
-                        "How did you handle unexpected challenges?"
-                    ]
-                },
-                {
-                    "question": "Describe a time when you had to learn a new technology quickly. How did you approach it?",
-                    "category": "Technical",
-                    "difficulty": "easy",
-                    "purpose": "Evaluate learning agility",
-                    "follow_up_suggestions": [
-                        "What resources did you use?",
-                        "How did you ensure quality while learning quickly?"
-                    ]
-                }
-            ],
-            "behavioral": [
-                {
-                    "question": "Tell me about a time when you had to work with a difficult team member. How did you handle it?",
-                    "category": "Behavioral",
-                    "difficulty": "medium",
-                    "purpose": "Assess conflict resolution skills",
-                    "follow_up_suggestions": [
-                        "What was the outcome?",
-                        "What did you learn from this experience?"
-                    ]
-                },
-                {
-                    "question": "Describe a situation where you had to meet a tight deadline. How did you manage it?",
-                    "category": "Behavioral",
-                    "difficulty": "easy",
-                    "purpose": "Evaluate time management and stress handling",
-                    "follow_up_suggestions": [
-                        "What strategies did you use?",
-                        "How did you ensure quality wasn't compromised?"
-                    ]
-                }
-            ],
-            "general": [
-                {
-                    "question": "Tell me about yourself and your professional background.",
-                    "category": "General",
-                    "difficulty": "easy",
-                    "purpose": "Get overview of candidate's experience",
-                    "follow_up_suggestions": [
-                        "What aspects of your background are most relevant to this role?",
-                        "What are you most proud of in your career?"
-                    ]
-                },
-                {
-                    "question": "Why are you interested in this position and our company?",
-                    "category": "General",
-                    "difficulty": "easy",
-                    "purpose": "Assess motivation and company research",
-                    "follow_up_suggestions": [
-                        "What specific aspects of our company culture appeal to you?",
-                        "How do you see yourself contributing to our team?"
-                    ]
-                }
-            ]
-        }
-        
-        questions = fallback_questions.get(question_type, fallback_questions["general"])
-        return questions[:count]
+        questions = _FALLBACK_QUESTIONS.get(question_type, _FALLBACK_QUESTIONS["general"])
+        # Deep-copied: the mapping is read-only but the question dicts inside it are not
+        return copy.deepcopy(questions[:count])
     
     def _get_fallback_followup_questions(self) -> List[Dict]:
         """Fallback follow-up questions when AI generation fails"""
-        return [
-            {
-                "question": "Can you provide a specific example of that?",
-                "relevance": "Asks for concrete evidence",
-                "purpose": "Verify claims with specific details"
-            },
-            {
-                "question": "What challenges did you face in that situation?",
-                "relevance": "Explores problem-solving approach",
-                "purpose": "Understand how candidate handles obstacles"
-            },
-            {
-                "question": "What would you do differently if you faced that situation again?",
-                "relevance": "Tests learning and self-reflection",
-                "purpose": "Assess growth mindset and continuous improvement"
-            }
-        ]
+        return copy.deepcopy(_FALLBACK_FOLLOWUP_QUESTIONS)
@@ -1,10 +1,199 @@
 import asyncio
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, AsyncIterator, Tuple
 import logging
+import re
 from datetime import datetime
+import numpy as np
+from jsonschema import Draft7Validator
+
+from .ai_service import ProviderError
+from .metrics_kernel import reduce_ratings
 
 logger = logging.getLogger(__name__)
 
+# Response schemas for the report sections and their validators, compiled once at import
+_EXECUTIVE_SUMMARY_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "key_highlights": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "concerns": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "recommendation": {"type": "string"}
+    },
+    "required": ["summary", "key_highlights", "concerns", "recommendation"]
+}
+
+_DETAILED_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "communication_analysis": {"type": "string"},
+        "technical_analysis": {"type": "string"},
+        "experience_analysis": {"type": "string"},
+        "cultural_fit_analysis": {"type": "string"},
+        "leadership_analysis": {"type": "string"},
+        "expertise_areas": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "knowledge_gaps": {
+            "type": "array",
+            "items": {"type": "string"}
+        }
+    },
+    "required": ["communication_analysis", "technical_analysis", "experience_analysis"]
+}
+
+_STRENGTHS_WEAKNESSES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "strengths": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "strength": {"type": "string"},
+                    "evidence": {"type": "string"},
+                    "impact": {"type": "string"}
+                }
+            }
+        },
+        "weaknesses": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "weakness": {"type": "string"},
+                    "evidence": {"type": "string"},
+                    "improvement_suggestion": {"type": "string"}
+                }
+            }
+        },
+        "red_flags": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "differentiators": {
+            "type": "array",
+            "items": {"type": "string"}
+        }
+    },
+    "required": ["strengths", "weaknesses"]
+}
+
+_RECOMMENDATIONS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "recommendation": {
+            "type": "string",
+            "enum": ["Strong Hire", "Hire", "No Hire", "Strong No Hire"]
+        },
+        "rationale": {"type": "string"},
+        "suggested_role_level": {"type": "string"},
+        "compensation_notes": {"type": "string"},
+        "onboarding_focus": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "probation_areas": {
+            "type": "array",
+            "items": {"type": "string"}
+        }
+    },
+    "required": ["recommendation", "rationale"]
+}
+
+_NEXT_STEPS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "next_steps": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "step": {"type": "string"},
+                    "timeline": {"type": "string"},
+                    "priority": {"type": "string", "enum": ["High", "Medium", "Low"]},
+                    "description": {"type": "string"}
+                }
+            }
+        }
+    },
+    "required": ["next_steps"]
+}
+
+_OVERALL_ASSESSMENT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "overall_score": {"type": "number", "minimum": 1, "maximum": 10},
+        "performance_level": {"type": "string"},
+        "key_takeaways": {
+            "type": "array",
+            "items": {"type": "string"}
+        },
+        "risk_assessment": {"type": "string"},
+        "success_potential": {"type": "string"}
+    },
+    "required": ["overall_score", "performance_level", "key_takeaways"]
+}
+
+_NEXT_STEPS_ITEMS_SCHEMA = _NEXT_STEPS_SCHEMA["properties"]["next_steps"]
+
+# One schema covering every AI-written section so the whole report can come from a single call
+_FULL_REPORT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "executive_summary": _EXECUTIVE_SUMMARY_SCHEMA,
+        "detailed_analysis": _DETAILED_ANALYSIS_SCHEMA,
+        "strengths_weaknesses": _STRENGTHS_WEAKNESSES_SCHEMA,
+        "recommendations": _RECOMMENDATIONS_SCHEMA,
+        "next_steps": _NEXT_STEPS_ITEMS_SCHEMA,
+        "overall_assessment": _OVERALL_ASSESSMENT_SCHEMA
+    },
+    "required": [
+        "executive_summary",
+        "detailed_analysis",
+        "strengths_weaknesses",
+        "recommendations",
+        "next_steps",
+        "overall_assessment"
+    ]
+}
+_SECTION_VALIDATORS = {
+    section: Draft7Validator(schema)
+    for section, schema in _FULL_REPORT_SCHEMA["properties"].items()
+}
+
+# Prompt budget for the transcript: long questions and answers are cut and, past
+# the total, only the most telling Q&A pairs are kept
+_MAX_QUESTION_CHARS = 400
+_MAX_ANSWER_CHARS = 800
+_MAX_TRANSCRIPT_CHARS = 12000
+
+def _clip(text, limit: int) -> str:
+    """Cut text to at most limit characters, marking the cut"""
+    text = str(text)
+    return text if len(text) <= limit else text[:max(0, limit - 1)] + "…"
+
+# Rating category boundaries: below 4 is Poor, then Average, Good and from 8 Excellent
+_RATING_THRESHOLDS = (4, 6, 8)
+_RATING_CATEGORIES = ("Poor", "Average", "Good", "Excellent")
+
+# Answer keywords and the insight each one signals, in reporting order. The lookahead
+# lets overlapping keywords all match in a single pass over the lowercased answer
+_INSIGHT_KEYWORDS = (
+    ("experience", "Mentioned relevant experience"),
+    ("challenge", "Discussed challenges"),
+    ("team", "Referenced teamwork"),
+    ("learn", "Showed learning mindset")
+)
+_INSIGHT_RE = re.compile(r'(?=(experience|challenge|team|learn))')
+
 class ReportGenerator:
     """Generate comprehensive interview reports using AI"""
     
@@ -16,48 +205,244 @@ class ReportGenerator:
         
         try:
             # Extract data
-            questions = interview_data.get('questions', [])
-            answers = interview_data.get('answers', [])
+            questions, answers = self._normalize(
+                interview_data.get('questions', []),
+                interview_data.get('answers', [])
+            )
             ratings = interview_data.get('ratings', [])
             duration = interview_data.get('duration', 0)
             candidate_info = interview_data.get('candidate_info', {})
             
-            # Generate different sections of the report
-            executive_summary = await self._generate_executive_summary(questions, answers, ratings, duration)
-            detailed_analysis = await self._generate_detailed_analysis(questions, answers, ratings)
-            strengths_weaknesses = await self._generate_strengths_weaknesses(questions, answers, ratings)
-            recommendations = await self._generate_recommendations(questions, answers, ratings, candidate_info)
-            next_steps = await self._generate_next_steps(ratings, candidate_info)
-            
-            # Calculate metrics
+            # Calculate metrics, and the average rating the prompts quote
             metrics = self._calculate_metrics(questions, answers, ratings, duration)
+            avg_rating = sum(ratings) / len(ratings) if ratings else 0
             
-            # Generate overall assessment
-            overall_assessment = await self._generate_overall_assessment(metrics, detailed_analysis)
+            # Format the transcript once; every AI-written section works from it
+            qa_text = self._format_qa_pairs(questions, answers, ratings)
+            
+            # Ask for every section in a single call, then regenerate any section the
+            # combined response left out or got wrong with its own call
+            sections = await self._generate_full_report_single_call(
+                qa_text, avg_rating, duration, candidate_info, metrics
+            )
+            
+            section_generators = self._section_generators(qa_text, questions, answers, avg_rating, duration, candidate_info)
+            missing = [section for section in section_generators if section not in sections]
+            
+            # Don't hold the overall assessment back for the detailed analysis: use the one
+            # the combined response produced, or speculate from the metrics alone
+            overall_task = None
+            if "overall_assessment" not in sections:
+                overall_task = asyncio.create_task(
+                    self._generate_overall_assessment(metrics, sections.get("detailed_analysis"))
+                )
+            
+            tasks = [asyncio.create_task(section_generators[section]()) for section in missing]
+            try:
+                if tasks:
+                    sections.update(zip(missing, await asyncio.gather(*tasks)))
+                
+                if overall_task is not None:
+                    overall_assessment = await overall_task
+                    if "detailed_analysis" in missing:
+                        overall_assessment = await self._refine_overall_assessment(
+                            overall_assessment, metrics, sections["detailed_analysis"]
+                        )
+                    sections["overall_assessment"] = overall_assessment
+            finally:
+                # Stop the remaining calls once one of them hits a provider error
+                for task in tasks + [overall_task]:
+                    if task is not None:
+                        task.cancel()
             
             return {
-                "report_metadata": {
-                    "generated_at": datetime.now().isoformat(),
-                    "interview_duration": duration,
-                    "total_questions": len(questions),
-                    "total_answers": len(answers),
-                    "ai_provider": self.ai_service.get_current_provider()
-                },
-                "executive_summary": executive_summary,
-                "overall_assessment": overall_assessment,
+                "report_metadata": self._report_metadata(questions, answers, duration),
+                "executive_summary": sections["executive_summary"],
+                "overall_assessment": sections["overall_assessment"],
                 "metrics": metrics,
-                "detailed_analysis": detailed_analysis,
-                "strengths_weaknesses": strengths_weaknesses,
-                "recommendations": recommendations,
-                "next_steps": next_steps,
+                "detailed_analysis": sections["detailed_analysis"],
+                "strengths_weaknesses": sections["strengths_weaknesses"],
+                "recommendations": sections["recommendations"],
+                "next_steps": sections["next_steps"],
                 "qa_analysis": self._generate_qa_analysis(questions, answers, ratings)
             }
             
+        except ProviderError:
+            raise
         except Exception as e:
             logger.error(f"Error generating report: {str(e)}")
             return self._get_fallback_report(interview_data)
     
-    async def _generate_executive_summary(self, questions: List, answers: List, ratings: List, duration: int) -> Dict:
+    async def generate_report_stream(self, interview_data: Dict) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield (section, value) pairs for the report as soon as each section is ready
+        
+        Locally computed sections come first, then the AI-written sections in the
+        order the combined response produces them. Sections it leaves out or gets
+        wrong are generated separately and yielded as they complete.
+        """
+        
+        questions, answers = self._normalize(
+            interview_data.get('questions', []),
+            interview_data.get('answers', [])
+        )
+        ratings = interview_data.get('ratings', [])
+        duration = interview_data.get('duration', 0)
+        candidate_info = interview_data.get('candidate_info', {})
+        
+        metrics = self._calculate_metrics(questions, answers, ratings, duration)
+        avg_rating = sum(ratings) / len(ratings) if ratings else 0
+        yield "report_metadata", self._report_metadata(questions, answers, duration)
+        yield "metrics", metrics
+        yield "qa_analysis", self._generate_qa_analysis(questions, answers, ratings)
+        
+        qa_text = self._format_qa_pairs(questions, answers, ratings)
+        sections = {}
+        try:
+            prompt = self._full_report_prompt(avg_rating, duration, candidate_info, metrics)
+            async for section, value in self.ai_service.generate_structured_response_stream(
+                prompt, _FULL_REPORT_SCHEMA, prefix=self._transcript_prefix(qa_text)
+            ):
+                validator = _SECTION_VALIDATORS.get(section)
+                if validator is not None and section not in sections and validator.is_valid(value):
+                    sections[section] = value
+                    yield section, value
+        except ProviderError:
+            raise
+        except Exception as e:
+            logger.error(f"Error streaming full report: {str(e)}")
+        
+        async def generate(section: str, generator) -> Tuple[str, Any]:
+            return section, await generator()
+        
+        section_generators = self._section_generators(qa_text, questions, answers, avg_rating, duration, candidate_info)
+        speculative = "detailed_analysis" not in sections
+        if "overall_assessment" not in sections:
+            # Generated alongside the other sections, speculatively from the metrics alone
+            # if the detailed analysis is still missing
+            detailed_analysis = sections.get("detailed_analysis")
+            section_generators["overall_assessment"] = lambda: self._generate_overall_assessment(
+                metrics, detailed_analysis
+            )
+        
+        tasks = [
+            asyncio.create_task(generate(section, generator))
+            for section, generator in section_generators.items()
+            if section not in sections
+        ]
+        speculative_assessment = None
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                section, value = await next_done
+                if section == "overall_assessment" and speculative:
+                    # Hold it back until the detailed analysis can confirm it
+                    speculative_assessment = value
+                    continue
+                sections[section] = value
+                yield section, value
+        finally:
+            # Stop outstanding sections if the consumer goes away early
+            for task in tasks:
+                task.cancel()
+        
+        if speculative_assessment is not None:
+            yield "overall_assessment", await self._refine_overall_assessment(
+                speculative_assessment, metrics, sections["detailed_analysis"]
+            )
+    
+    async def _generate_full_report_single_call(
+        self,
+        qa_text: str,
+        avg_rating: float,
+        duration: int,
+        candidate_info: Dict,
+        metrics: Dict
+    ) -> Dict:
+        """Generate every AI-written report section with one structured call
+        
+        Returns only the sections that came back valid, so callers can fill
+        in the rest section by section.
+        """
+        
+        try:
+            prompt = self._full_report_prompt(avg_rating, duration, candidate_info, metrics)
+            
+            response = await self.ai_service.generate_structured_response(
+                prompt, _FULL_REPORT_SCHEMA, semantic_text=qa_text, prefix=self._transcript_prefix(qa_text)
+            )
+            
+        except ProviderError:
+            # A rate-limited or failing provider would fail the per-section calls too
+            raise
+        except Exception as e:
+            logger.error(f"Error generating full report: {str(e)}")
+            return {}
+        
+        sections = {}
+        for section, validator in _SECTION_VALIDATORS.items():
+            if isinstance(response, dict) and section in response and validator.is_valid(response[section]):
+                sections[section] = response[section]
+            else:
+                logger.warning(f"Full report response has no valid {section}; generating it separately")
+        
+        return sections
+    
+    def _full_report_prompt(self, avg_rating: float, duration: int, candidate_info: Dict, metrics: Dict) -> str:
+        """Create the prompt asking for every AI-written section at once"""
+        return f"""
+        Write a complete hiring report for the interview transcript above.
+        
+        Candidate Info: {candidate_info}
+        Average Rating: {avg_rating:.1f}/10
+        Interview Duration: {duration} minutes
+        Metrics: {metrics}
+        
+        Provide these sections:
+        1. executive_summary: a concise 2-3 paragraph summary with key highlights,
+           concerns and a recommendation for next steps
+        2. detailed_analysis: communication, technical knowledge, experience relevance,
+           cultural fit, leadership and teamwork, areas of expertise and knowledge gaps
+        3. strengths_weaknesses: top 3-5 strengths with evidence, top 3-5 areas for
+           improvement, red flags and differentiators
+        4. recommendations: a hiring recommendation (Strong Hire, Hire, No Hire,
+           Strong No Hire) with rationale, role level, compensation notes,
+           onboarding focus and probation areas
+        5. next_steps: specific, actionable next steps in the hiring process with timelines
+        6. overall_assessment: overall score and rationale, key takeaways,
+           risk assessment and potential for success in the role
+        """
+    
+    def _section_generators(
+        self,
+        qa_text: str,
+        questions: List,
+        answers: List,
+        avg_rating: float,
+        duration: int,
+        candidate_info: Dict
+    ) -> Dict:
+        """Per-section generators used when the combined response misses a section
+        
+        The overall assessment is not included since it needs the detailed analysis.
+        """
+        return {
+            "executive_summary": lambda: self._generate_executive_summary(questions, answers, avg_rating, duration),
+            "detailed_analysis": lambda: self._generate_detailed_analysis(qa_text),
+            "strengths_weaknesses": lambda: self._generate_strengths_weaknesses(qa_text),
+            "recommendations": lambda: self._generate_recommendations(qa_text, avg_rating, candidate_info),
+            "next_steps": lambda: self._generate_next_steps(avg_rating, candidate_info)
+        }
+    
+    def _report_metadata(self, questions: List, answers: List, duration: int) -> Dict:
+        """Build the report's metadata section"""
+        return {
+            "generated_at": datetime.now().isoformat(),
+            "interview_duration": duration,
+            "total_questions": len(questions),
+            "total_answers": len(answers),
+            "ai_provider": self.ai_service.get_current_provider()
+        }
+    
+    async def _generate_executive_summary(self, questions: List, answers: List, avg_rating: float, duration: int) -> Dict:
         """Generate executive summary of the interview"""
         
         try:
@@ -66,7 +451,7 @@ class ReportGenerator:
             
             Total Questions: {len(questions)}
             Total Answers: {len(answers)}
-            Average Rating: {sum(ratings)/len(ratings) if ratings else 0:.1f}/10
+            Average Rating: {avg_rating:.1f}/10
             Interview Duration: {duration} minutes
             
             Questions Asked:
@@ -82,39 +467,21 @@ class ReportGenerator:
             4. Recommendation for next steps
             """
             
-            schema = {
-                "type": "object",
-                "properties": {
-                    "summary": {"type": "string"},
-                    "key_highlights": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "concerns": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "recommendation": {"type": "string"}
-                },
-                "required": ["summary", "key_highlights", "concerns", "recommendation"]
-            }
-            
-            response = await self.ai_service.generate_structured_response(prompt, schema)
+            response = await self.ai_service.generate_structured_response(prompt, _EXECUTIVE_SUMMARY_SCHEMA)
             return response
             
+        except ProviderError:
+            raise
         except Exception as e:
             logger.error(f"Error generating executive summary: {str(e)}")
-            return self._get_fallback_executive_summary(ratings)
+            return self._get_fallback_executive_summary(avg_rating)
     
-    async def _generate_detailed_analysis(self, questions: List, answers: List, ratings: List) -> Dict:
+    async def _generate_detailed_analysis(self, qa_text: str) -> Dict:
         """Generate detailed analysis of interview performance"""
         
         try:
-            prompt = f"""
-            Provide detailed analysis of interview performance:
-            
-            Questions and Answers:
-            {self._format_qa_pairs(questions, answers, ratings)}
+            prompt = """
+            Provide detailed analysis of interview performance based on the transcript above.
             
             Analyze:
             1. Communication skills and clarity
@@ -126,41 +493,23 @@ class ReportGenerator:
             7. Knowledge gaps identified
             """
             
-            schema = {
-                "type": "object",
-                "properties": {
-                    "communication_analysis": {"type": "string"},
-                    "technical_analysis": {"type": "string"},
-                    "experience_analysis": {"type": "string"},
-                    "cultural_fit_analysis": {"type": "string"},
-                    "leadership_analysis": {"type": "string"},
-                    "expertise_areas": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "knowledge_gaps": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    }
-                },
-                "required": ["communication_analysis", "technical_analysis", "experience_analysis"]
-            }
-            
-            response = await self.ai_service.generate_structured_response(prompt, schema)
+            response = await self.ai_service.generate_structured_response(
+                prompt, _DETAILED_ANALYSIS_SCHEMA, semantic_text=qa_text, prefix=self._transcript_prefix(qa_text)
+            )
             return response
             
+        except ProviderError:
+            raise
         except Exception as e:
             logger.error(f"Error generating detailed analysis: {str(e)}")
             return self._get_fallback_detailed_analysis()
     
-    async def _generate_strengths_weaknesses(self, questions: List, answers: List, ratings: List) -> Dict:
+    async def _generate_strengths_weaknesses(self, qa_text: str) -> Dict:
         """Generate strengths and weaknesses analysis"""
         
         try:
-            prompt = f"""
-            Analyze the candidate's strengths and weaknesses based on this interview:
-            
-            {self._format_qa_pairs(questions, answers, ratings)}
+            prompt = """
+            Analyze the candidate's strengths and weaknesses based on the interview transcript above.
             
             Identify:
             1. Top 3-5 strengths with specific evidence
@@ -169,62 +518,27 @@ class ReportGenerator:
             4. Unique qualities or differentiators
             """
             
-            schema = {
-                "type": "object",
-                "properties": {
-                    "strengths": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "strength": {"type": "string"},
-                                "evidence": {"type": "string"},
-                                "impact": {"type": "string"}
-                            }
-                        }
-                    },
-                    "weaknesses": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "weakness": {"type": "string"},
-                                "evidence": {"type": "string"},
-                                "improvement_suggestion": {"type": "string"}
-                            }
-                        }
-                    },
-                    "red_flags": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "differentiators": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    }
-                },
-                "required": ["strengths", "weaknesses"]
-            }
-            
-            response = await self.ai_service.generate_structured_response(prompt, schema)
+            response = await self.ai_service.generate_structured_response(
+                prompt, _STRENGTHS_WEAKNESSES_SCHEMA, semantic_text=qa_text, prefix=self._transcript_prefix(qa_text)
+            )
             return response
             
+        except ProviderError:
+            raise
         except Exception as e:
             logger.error(f"Error generating strengths/weaknesses: {str(e)}")
             return self._get_fallback_strengths_weaknesses()
     
-    async def _generate_recommendations(self, questions: List, answers: List, ratings: List, candidate_info: Dict) -> Dict:
+    async def _generate_recommendations(self, qa_text: str, avg_rating: float, candidate_info: Dict) -> Dict:
         """Generate hiring recommendations"""
         
         try:
-            avg_rating = sum(ratings) / len(ratings) if ratings else 0
-            
             prompt = f"""
             Provide hiring recommendations based on this interview:
             
             Candidate Info: {candidate_info}
             Average Rating: {avg_rating:.1f}/10
-            Interview Data: {self._format_qa_pairs(questions, answers, ratings)}
+            Interview Data: see the transcript above
             
             Provide:
             1. Hiring recommendation (Strong Hire, Hire, No Hire, Strong No Hire)
@@ -235,41 +549,21 @@ class ReportGenerator:
             6. Areas to focus on during probation
             """
             
-            schema = {
-                "type": "object",
-                "properties": {
-                    "recommendation": {
-                        "type": "string",
-                        "enum": ["Strong Hire", "Hire", "No Hire", "Strong No Hire"]
-                    },
-                    "rationale": {"type": "string"},
-                    "suggested_role_level": {"type": "string"},
-                    "compensation_notes": {"type": "string"},
-                    "onboarding_focus": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "probation_areas": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    }
-                },
-                "required": ["recommendation", "rationale"]
-            }
-            
-            response = await self.ai_service.generate_structured_response(prompt, schema)
+            response = await self.ai_service.generate_structured_response(
+                prompt, _RECOMMENDATIONS_SCHEMA, semantic_text=qa_text, prefix=self._transcript_prefix(qa_text)
+            )
             return response
             
+        except ProviderError:
+            raise
         except Exception as e:
             logger.error(f"Error generating recommendations: {str(e)}")
             return self._get_fallback_recommendations(avg_rating)
     
-    async def _generate_next_steps(self, ratings: List, candidate_info: Dict) -> List[Dict]:
+    async def _generate_next_steps(self, avg_rating: float, candidate_info: Dict) -> List[Dict]:
         """Generate next steps for the hiring process"""
         
         try:
-            avg_rating = sum(ratings) / len(ratings) if ratings else 0
-            
             prompt = f"""
             Suggest next steps in the hiring process based on:
             
@@ -279,41 +573,25 @@ class ReportGenerator:
             Provide specific, actionable next steps with timelines.
             """
             
-            schema = {
-                "type": "object",
-                "properties": {
-                    "next_steps": {
-                        "type": "array",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "step": {"type": "string"},
-                                "timeline": {"type": "string"},
-                                "priority": {"type": "string", "enum": ["High", "Medium", "Low"]},
-                                "description": {"type": "string"}
-                            }
-                        }
-                    }
-                },
-                "required": ["next_steps"]
-            }
-            
-            response = await self.ai_service.generate_structured_response(prompt, schema)
+            response = await self.ai_service.generate_structured_response(prompt, _NEXT_STEPS_SCHEMA)
             return response.get("next_steps", [])
             
+        except ProviderError:
+            raise
         except Exception as e:
             logger.error(f"Error generating next steps: {str(e)}")
             return self._get_fallback_next_steps(avg_rating)
     
-    async def _generate_overall_assessment(self, metrics: Dict, detailed_analysis: Dict) -> Dict:
-        """Generate overall assessment"""
+    async def _generate_overall_assessment(self, metrics: Dict, detailed_analysis: Optional[Dict]) -> Dict:
+        """Generate overall assessment, from the metrics alone if there is no detailed analysis yet"""
         
         try:
+            analysis_line = f"Detailed Analysis: {detailed_analysis}" if detailed_analysis is not None else ""
             prompt = f"""
             Provide an overall assessment based on these metrics and analysis:
             
             Metrics: {metrics}
-            Detailed Analysis: {detailed_analysis}
+            {analysis_line}
             
             Give a comprehensive overall assessment including:
             1. Overall performance score and rationale
@@ -322,46 +600,43 @@ class ReportGenerator:
             4. Potential for success in the role
             """
             
-            schema = {
-                "type": "object",
-                "properties": {
-                    "overall_score": {"type": "number", "minimum": 1, "maximum": 10},
-                    "performance_level": {"type": "string"},
-                    "key_takeaways": {
-                        "type": "array",
-                        "items": {"type": "string"}
-                    },
-                    "risk_assessment": {"type": "string"},
-                    "success_potential": {"type": "string"}
-                },
-                "required": ["overall_score", "performance_level", "key_takeaways"]
-            }
-            
-            response = await self.ai_service.generate_structured_response(prompt, schema)
+            response = await self.ai_service.generate_structured_response(prompt, _OVERALL_ASSESSMENT_SCHEMA)
             return response
             
+        except ProviderError:
+            raise
         except Exception as e:
             logger.error(f"Error generating overall assessment: {str(e)}")
             return self._get_fallback_overall_assessment(metrics)
     
+    async def _refine_overall_assessment(self, assessment: Dict, metrics: Dict, detailed_analysis: Dict) -> Dict:
+        """Keep a metrics-only assessment unless its score strays from the measured average"""
+        average_rating = metrics.get("average_rating")
+        score = assessment.get("overall_score")
+        if average_rating is None or not isinstance(score, (int, float)) or abs(score - average_rating) <= 1:
+            return assessment
+        
+        logger.info(f"Speculative overall score {score} is off the average rating {average_rating}; regenerating")
+        return await self._generate_overall_assessment(metrics, detailed_analysis)
+    
     def _calculate_metrics(self, questions: List, answers: List, ratings: List, duration: int) -> Dict:
         """Calculate interview metrics"""
         
         if not ratings:
             return {"error": "No ratings available"}
         
-        avg_rating = sum(ratings) / len(ratings)
-        max_rating = max(ratings)
-        min_rating = min(ratings)
+        # Reduce the ratings in one kernel call (Numba-compiled when available)
+        avg_rating, variance, max_index, min_index, excellent_responses, poor_responses = reduce_ratings(ratings)
+        
+        # Keep the original rating values (and their int/float type) for max and min
+        max_rating = ratings[max_index]
+        min_rating = ratings[min_index]
         
         # Calculate consistency (lower standard deviation = more consistent)
-        variance = sum((r - avg_rating) ** 2 for r in ratings) / len(ratings)
         consistency = 10 - min(9, variance)  # Convert to 1-10 scale
         
         # Calculate response quality distribution
-        excellent_responses = len([r for r in ratings if r >= 8])
-        good_responses = len([r for r in ratings if 6 <= r < 8])
-        poor_responses = len([r for r in ratings if r < 6])
+        good_responses = len(ratings) - excellent_responses - poor_responses
         
         return {
             "average_rating": round(avg_rating, 2),
@@ -382,42 +657,30 @@ class ReportGenerator:
         """Generate Q&A specific analysis"""
         
         qa_analysis = []
+        categories = self._get_rating_categories(ratings)
         
-        for i, (question, answer, rating) in enumerate(zip(questions, answers, ratings)):
+        for i, (question, answer, rating, category) in enumerate(zip(questions, answers, ratings, categories)):
             qa_analysis.append({
                 "question_number": i + 1,
-                "question": question.get('text', question) if isinstance(question, dict) else question,
-                "answer": answer.get('answer', answer) if isinstance(answer, dict) else answer,
+                "question": question,
+                "answer": answer,
                 "rating": rating,
-                "rating_category": self._get_rating_category(rating),
-                "key_insights": self._extract_key_insights(answer.get('answer', answer) if isinstance(answer, dict) else answer)
+                "rating_category": category,
+                "key_insights": self._extract_key_insights(answer)
             })
         
         return qa_analysis
     
-    def _get_rating_category(self, rating: float) -> str:
-        """Categorize rating"""
-        if rating >= 8:
-            return "Excellent"
-        elif rating >= 6:
-            return "Good"
-        elif rating >= 4:
-            return "Average"
-        else:
-            return "Poor"
+    def _get_rating_categories(self, ratings: List) -> List[str]:
+        """Categorize every rating in one vectorized pass"""
+        bins = np.digitize(np.asarray(ratings, dtype=np.float64), _RATING_THRESHOLDS)
+        return [_RATING_CATEGORIES[index] for index in bins.tolist()]
     
     def _extract_key_insights(self, answer: str) -> List[str]:
         """Extract key insights from answer"""
-        # Simple keyword extraction
-        keywords = []
-        if "experience" in answer.lower():
-            keywords.append("Mentioned relevant experience")
-        if "challenge" in answer.lower():
-            keywords.append("Discussed challenges")
-        if "team" in answer.lower():
-            keywords.append("Referenced teamwork")
-        if "learn" in answer.lower():
-            keywords.append("Showed learning mindset")
+        # Simple keyword extraction in one scan of the answer
+        matched = {match.group(1) for match in _INSIGHT_RE.finditer(answer.lower())}
+        keywords = [insight for keyword, insight in _INSIGHT_KEYWORDS if keyword in matched]
         
         return keywords[:3]  # Top 3 insights
     
@@ -426,37 +689,74 @@ class ReportGenerator:
         if not questions:
             return "No questions available"
         
-        formatted = []
-        for i, q in enumerate(questions, 1):
-            question_text = q.get('text', q) if isinstance(q, dict) else q
-            formatted.append(f"{i}. {question_text}")
-        
-        return "\n".join(formatted)
+        return "\n".join([f"{i}. {question}" for i, question in enumerate(questions, 1)])
     
     def _format_answers_for_prompt(self, answers: List) -> str:
         """Format answers for AI prompt"""
         if not answers:
             return "No answers available"
         
-        formatted = []
-        for i, a in enumerate(answers, 1):
-            answer_text = a.get('answer', a) if isinstance(a, dict) else a
-            formatted.append(f"{i}. {answer_text[:200]}...")  # Truncate for prompt
+        # Truncate for prompt
+        return "\n".join([f"{i}. {answer[:200]}..." for i, answer in enumerate(answers, 1)])
+    
+    def _normalize(self, questions: List, answers: List) -> Tuple[List, List]:
+        """Unwrap question and answer records to their text once, for all the formatters below"""
+        return (
+            [q.get('text', q) if isinstance(q, dict) else q for q in questions],
+            [a.get('answer', a) if isinstance(a, dict) else a for a in answers]
+        )
+    
+    def _transcript_prefix(self, qa_text: str) -> str:
+        """Shared leading prompt segment holding the interview transcript
         
-        return "\n".join(formatted)
+        Every transcript-based section prompt leads with it so providers can reuse its
+        prefill, and passes the Q&A as semantic_text so similar interviews can reuse a
+        section with only the Q&A compared by meaning.
+        """
+        return f"Interview transcript:\n\n{qa_text}\n"
     
-    def _format_qa_pairs(self, questions: List, answers: List, ratings: List) -> str:
-        """Format Q&A pairs for AI prompt"""
+    def _format_qa_pairs(
+        self,
+        questions: List,
+        answers: List,
+        ratings: List,
+        max_question_chars: int = _MAX_QUESTION_CHARS,
+        max_answer_chars: int = _MAX_ANSWER_CHARS,
+        max_total_chars: int = _MAX_TRANSCRIPT_CHARS
+    ) -> str:
+        """Format Q&A pairs for AI prompt, truncating long questions, answers and transcripts"""
         if not questions:
             return "No Q&A data available"
         
-        formatted = []
-        for i, (q, a, r) in enumerate(zip(questions, answers, ratings), 1):
-            question_text = q.get('text', q) if isinstance(q, dict) else q
-            answer_text = a.get('answer', a) if isinstance(a, dict) else a
-            formatted.append(f"Q{i}: {question_text}\nA{i}: {answer_text}\nRating: {r}/10\n")
+        pairs = [
+            f"Q{i}: {_clip(q, max_question_chars)}\nA{i}: {_clip(a, max_answer_chars)}\nRating: {r}/10\n"
+            for i, (q, a, r) in enumerate(zip(questions, answers, ratings), 1)
+        ]
+        if sum(map(len, pairs)) + len(pairs) - 1 <= max_total_chars:
+            return "\n".join(pairs)
+        
+        # Over budget: keep the highest and lowest rated pairs, which say the most about
+        # the candidate, alternating from both ends until the budget (less the note) is used
+        budget = max_total_chars - len(f"({len(pairs)} of {len(pairs)} Q&A pairs shown: the highest and lowest rated)\n")
+        order = np.argsort(np.asarray(ratings[:len(pairs)], dtype=np.float64), kind="stable")
+        low, high = 0, len(order) - 1
+        kept = []
+        size = 0
+        while low <= high:
+            index = int(order[high] if len(kept) % 2 == 0 else order[low])
+            if kept and size + len(pairs[index]) + 1 > budget:
+                break
+            kept.append(index)
+            size += len(pairs[index]) + 1
+            if len(kept) % 2 == 1:
+                high -= 1
+            else:
+                low += 1
         
-        return "\n".join(formatted)
+        kept.sort()
+        note = f"({len(kept)} of {len(pairs)} Q&A pairs shown: the highest and lowest rated)\n"
+        # A single pair can still be over budget on its own, so cut the result to fit
+        return _clip(note + "\n".join([pairs[index] for index in kept]), max_total_chars)
     
     # Fallback methods for when AI generation fails
     def _get_fallback_report(self, interview_data: Dict) -> Dict:
@@ -491,9 +791,8 @@ class ReportGenerator:
             }
         }
     
-    def _get_fallback_executive_summary(self, ratings: List) -> Dict:
+    def _get_fallback_executive_summary(self, avg_rating: float) -> Dict:
         """Fallback executive summary"""
-        avg_rating = sum(ratings) / len(ratings) if ratings else 0
         return {
             "summary": f"Interview completed with average rating of {avg_rating:.1f}/10. Manual review recommended.",
             "key_highlights": ["Interview conducted"],
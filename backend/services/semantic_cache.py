@@ -0,0 +1,75 @@
+import threading
+from typing import Any, Dict, Optional
+import logging
+
+import numpy as np
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+logger = logging.getLogger(__name__)
+
+class SemanticCache:
+    """Cache responses by prompt meaning so paraphrased prompts reuse earlier answers"""
+    
+    def __init__(
+        self,
+        threshold: float = 0.92,
+        maxsize: int = 1024,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2"
+    ):
+        self.threshold = threshold
+        self.maxsize = maxsize
+        self.model_name = model_name
+        self._model = None
+        self._model_lock = threading.Lock()
+        
+        # Per-namespace matrix of normalized embeddings plus the parallel responses
+        self._vectors: Dict[str, np.ndarray] = {}
+        self._responses: Dict[str, list] = {}
+    
+    @staticmethod
+    def is_available() -> bool:
+        """Check whether the embedding model dependency is installed"""
+        return SentenceTransformer is not None
+    
+    def embed(self, text: str) -> np.ndarray:
+        """Embed text as a unit-length vector (CPU-bound, call off the event loop)"""
+        with self._model_lock:
+            if self._model is None:
+                logger.info(f"Loading semantic cache embedding model: {self.model_name}")
+                self._model = SentenceTransformer(self.model_name)
+        
+        vector = self._model.encode([text], normalize_embeddings=True)[0]
+        return np.asarray(vector, dtype=np.float32)
+    
+    def lookup(self, namespace: str, vector: np.ndarray) -> Optional[Any]:
+        """Return the cached response most similar to the vector, if close enough"""
+        vectors = self._vectors.get(namespace)
+        if vectors is None or not len(vectors):
+            return None
+        
+        # Vectors are normalized, so the inner product is the cosine similarity
+        similarities = vectors @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] >= self.threshold:
+            return self._responses[namespace][best]
+        return None
+    
+    def add(self, namespace: str, vector: np.ndarray, response: Any):
+        """Remember a response, evicting the oldest entries past maxsize"""
+        vectors = self._vectors.get(namespace)
+        if vectors is None:
+            vectors = np.empty((0, len(vector)), dtype=np.float32)
+            self._responses[namespace] = []
+        
+        self._vectors[namespace] = np.vstack([vectors, vector])[-self.maxsize:]
+        self._responses[namespace].append(response)
+        del self._responses[namespace][:-self.maxsize]
+    
+    def clear(self):
+        """Drop all cached entries"""
+        self._vectors.clear()
+        self._responses.clear()
@@ -1,12 +1,11 @@
 #!/usr/bin/env python3
 """
 Smart Interviewer Backend Startup Script
-This script starts the Python Flask backend server for the Smart Interviewer extension.
+This script starts the Python Quart backend server for the Smart Interviewer extension.
 """
 
 import os
 import sys
-import subprocess
 import time
 from pathlib import Path
 
@@ -22,9 +21,10 @@ def check_python_version():
 def check_dependencies():
     """Check if required dependencies are installed"""
     try:
-        import flask
-        import flask_cors
+        import quart
+        import quart_cors
         import requests
+        import numpy
         print("✅ Required dependencies found")
         return True
     except ImportError as e:
@@ -74,22 +74,25 @@ def check_api_key():
     return True
 
 def start_server():
-    """Start the Flask server"""
+    """Start the Quart server"""
     print("\n🚀 Starting Smart Interviewer Backend Server...")
     print("📍 Server will be available at: http://localhost:5000")
     print("🛑 Press Ctrl+C to stop the server\n")
     
     try:
-        # Change to backend directory
-        os.chdir("backend")
+        # Import from backend without changing directory, so the dev server's
+        # reloader can still find this script when it restarts
+        sys.path.insert(0, str(Path("backend").resolve()))
         
-        # Start the Flask app
-        subprocess.run([sys.executable, "app.py"], check=True)
+        # Start the Quart app in this interpreter, reusing the modules the checks
+        # already imported instead of launching a second Python process
+        from app import run_server
+        
+        port = int(os.getenv('PORT', 5000))
+        debug = os.getenv('DEBUG', 'False').lower() == 'true'
+        run_server(port, debug)
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Error starting server: {e}")
-        return False
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
         return False
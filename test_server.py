@@ -1,83 +1,269 @@
 #!/usr/bin/env python3
 """
 Simple test script to verify the Smart Interviewer backend is working
+
+Run it directly for a printed report, or under pytest, where each endpoint is
+its own test (skipped when the backend isn't running). With pytest-xdist
+installed, `pytest -n auto test_server.py` runs the tests in parallel.
 """
 
+import asyncio
+import logging
+import os
+import socket
 import requests
 import json
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Tuple
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pytest
+except ImportError:  # Only needed when run under pytest
+    pytest = None
+
+BASE_URL = "http://localhost:5000"
+HEALTH_URL = BASE_URL + "/health"
+PROVIDERS_URL = BASE_URL + "/api/providers"
+SUGGEST_URL = BASE_URL + "/api/suggest-questions"
+
+TEST_DATA = {
+    "context": "Software Engineer interview",
+    "type": "technical",
+    "count": 3,
+    "previous_questions": [],
+    "candidate_info": {"role": "Software Engineer", "experience_level": "mid"}
+}
+logger = logging.getLogger(__name__)
+
+# Serialized once; the session already sends the JSON Content-Type header
+SUGGEST_BODY = orjson.dumps(TEST_DATA) if orjson is not None else json.dumps(TEST_DATA).encode()
+
+def _socket_options() -> list:
+    """Socket options for backend connections"""
+    # Disable Nagle so the small JSON POST isn't held back waiting to coalesce
+    options = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    ]
+    
+    # Optional buffer sizes for high-latency links to a remote deployment; left unset,
+    # the kernel keeps auto-tuning them, which is what localhost wants
+    for option, env in ((socket.SO_SNDBUF, "SNDBUF"), (socket.SO_RCVBUF, "RCVBUF")):
+        if os.environ.get(env):
+            options.append((socket.SOL_SOCKET, option, int(os.environ[env])))
+    return options
+
+class _TunedAdapter(HTTPAdapter):
+    """Adapter whose connections send small requests immediately and stay alive"""
+    
+    socket_options = _socket_options()
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self.socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+# Absorb transient failures, e.g. the port briefly unbound while the backend reloads.
+# Only failed connects and gateway errors are retried: a read timeout means the server
+# is still working on the request, and resending it would start another LLM generation.
+# After the last attempt the error response is returned so its status gets reported
+RETRY = Retry(
+    total=3,
+    read=False,
+    backoff_factor=0.2,
+    status_forcelist=(502, 503, 504),
+    allowed_methods=frozenset(["HEAD", "GET", "POST"]),
+    raise_on_status=False
+)
+
+def make_session(pool_maxsize: int = 4) -> requests.Session:
+    """Create a pooled, retrying session for the backend host that sends JSON"""
+    session = requests.Session()
+    session.mount("http://", _TunedAdapter(pool_connections=1, pool_maxsize=pool_maxsize, max_retries=RETRY))
+    session.headers.update({"Content-Type": "application/json"})
+    return session
+
+# Connecting to localhost takes milliseconds, so a refused or stalled connect fails fast
+# while the read timeouts still leave room for slow LLM-backed responses
+CONNECT_TIMEOUT = 0.25
+
+# Hard cap on the concurrent checks, so an unhealthy backend can't stall a watchdog for long
+DEADLINE_S = 8.0
+
+# Only this much of a failed response's body is read and reported
+ERROR_SNIPPET_BYTES = 2048
+
+# One pooled session so every check reuses the same keep-alive connection
+SESSION = make_session()
 
-def test_server():
+def main():
     """Test the backend server endpoints"""
-    base_url = "http://localhost:5000"
+    logger.info("🧪 Testing Smart Interviewer Backend Server")
+    logger.info("=" * 50)
     
-    print("🧪 Testing Smart Interviewer Backend Server")
-    print("=" * 50)
+    try:
+        _warm(SESSION)
+        return asyncio.run(_run_checks())
+    finally:
+        # Release the pooled sockets
+        SESSION.close()
+
+def _warm(session: requests.Session):
+    """Open a pooled connection up front so the first check's latency is the endpoint's own"""
+    try:
+        session.head(HEALTH_URL, timeout=(CONNECT_TIMEOUT, 1))
+    except requests.RequestException:
+        pass  # The health check reports the failure
+
+def _load(response: requests.Response):
+    """Parse a JSON response body, straight from the raw bytes when orjson is available"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def _timeout(read: float) -> Tuple[float, float]:
+    """(connect, read) timeouts, the read capped at the deadline so stragglers end soon after it"""
+    return CONNECT_TIMEOUT, min(read, DEADLINE_S)
+
+def _post_suggestions(session: requests.Session, timeout: Tuple[float, float]) -> requests.Response:
+    """POST the suggestion request, reading the body only if it succeeded"""
+    # Streamed so an error body is only read as far as it gets reported
+    response = session.post(SUGGEST_URL, data=SUGGEST_BODY, timeout=timeout, stream=True)
+    if response.status_code == 200:
+        response.content  # Read here, within the deadline
+    return response
+
+def _error_snippet(response: requests.Response) -> str:
+    """Read at most the first ERROR_SNIPPET_BYTES of a streamed response body, then close it"""
+    try:
+        return response.raw.read(ERROR_SNIPPET_BYTES, decode_content=True).decode("utf-8", "replace")
+    finally:
+        response.close()
+
+def _outcome(future: asyncio.Future, pending: set):
+    """A check's response or the exception it failed with, a timeout if it missed the deadline"""
+    if future in pending:
+        return TimeoutError(f"no response within the {DEADLINE_S}s deadline")
+    return future.exception() or future.result()
+
+def _unwrap(result):
+    """Return a check's response, re-raising the exception its request failed with"""
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+async def _run_checks() -> bool:
+    """Run the endpoint checks against the server concurrently, then report them in order"""
+    loop = asyncio.get_running_loop()
+    # Not the default executor, which asyncio.run would wait on for checks past the deadline
+    executor = ThreadPoolExecutor(max_workers=3)
+    
+    # The checks are independent I/O waits, so all three requests are in flight at once
+    checks = [
+        loop.run_in_executor(executor, partial(SESSION.get, HEALTH_URL, timeout=_timeout(5))),
+        loop.run_in_executor(executor, partial(SESSION.get, PROVIDERS_URL, timeout=_timeout(5))),
+        loop.run_in_executor(executor, partial(_post_suggestions, SESSION, _timeout(10)))
+    ]
+    try:
+        _, pending = await asyncio.wait(checks, timeout=DEADLINE_S)
+    finally:
+        executor.shutdown(wait=False)
+    health, providers, suggestions = (_outcome(check, pending) for check in checks)
     
     # Test 1: Health check
-    print("1. Testing health endpoint...")
+    logger.info("1. Testing health endpoint...")
     try:
-        response = requests.get(f"{base_url}/health", timeout=5)
+        response = _unwrap(health)
         if response.status_code == 200:
-            data = response.json()
-            print(f"   ✅ Health check passed: {data['status']}")
-            print(f"   📊 AI Provider: {data['ai_provider']}")
+            data = _load(response)
+            logger.info("   ✅ Health check passed: %s", data["status"])
+            logger.info("   📊 AI Provider: %s", data["ai_provider"])
         else:
-            print(f"   ❌ Health check failed: {response.status_code}")
+            logger.error("   ❌ Health check failed: %s", response.status_code)
             return False
     except Exception as e:
-        print(f"   ❌ Health check error: {e}")
+        logger.error("   ❌ Health check error: %s", e)
         return False
     
     # Test 2: Providers endpoint
-    print("\n2. Testing providers endpoint...")
+    logger.info("\n2. Testing providers endpoint...")
     try:
-        response = requests.get(f"{base_url}/api/providers", timeout=5)
+        response = _unwrap(providers)
         if response.status_code == 200:
-            data = response.json()
-            print(f"   ✅ Providers endpoint working")
-            print(f"   📋 Available providers: {len(data.get('providers', []))}")
+            data = _load(response)
+            logger.info("   ✅ Providers endpoint working")
+            logger.info("   📋 Available providers: %d", len(data.get("providers", [])))
         else:
-            print(f"   ❌ Providers endpoint failed: {response.status_code}")
+            logger.error("   ❌ Providers endpoint failed: %s", response.status_code)
     except Exception as e:
-        print(f"   ❌ Providers endpoint error: {e}")
+        logger.error("   ❌ Providers endpoint error: %s", e)
     
     # Test 3: Suggest questions (with fallback data)
-    print("\n3. Testing question suggestion...")
+    logger.info("\n3. Testing question suggestion...")
     try:
-        test_data = {
-            "context": "Software Engineer interview",
-            "type": "technical",
-            "count": 3,
-            "previous_questions": [],
-            "candidate_info": {"role": "Software Engineer", "experience_level": "mid"}
-        }
-        
-        response = requests.post(
-            f"{base_url}/api/suggest-questions",
-            json=test_data,
-            headers={"Content-Type": "application/json"},
-            timeout=10
-        )
-        
+        response = _unwrap(suggestions)
         if response.status_code == 200:
-            data = response.json()
+            data = _load(response)
             if data.get('success'):
                 questions = data.get('questions', [])
-                print(f"   ✅ Question generation working")
-                print(f"   📝 Generated {len(questions)} questions")
+                logger.info("   ✅ Question generation working")
+                logger.info("   📝 Generated %d questions", len(questions))
                 if questions:
-                    print(f"   💡 Sample question: {questions[0].get('question', 'N/A')[:50]}...")
+                    logger.info("   💡 Sample question: %.50s...", questions[0].get("question", "N/A"))
             else:
-                print(f"   ⚠️  Question generation returned error: {data.get('error')}")
+                logger.warning("   ⚠️  Question generation returned error: %s", data.get("error"))
         else:
-            print(f"   ❌ Question generation failed: {response.status_code}")
-            print(f"   📄 Response: {response.text}")
+            logger.error("   ❌ Question generation failed: %s", response.status_code)
+            logger.error("   📄 Response: %s", _error_snippet(response))
     except Exception as e:
-        print(f"   ❌ Question generation error: {e}")
+        logger.error("   ❌ Question generation error: %s", e)
     
-    print("\n" + "=" * 50)
-    print("🎯 Test completed! Check the results above.")
+    logger.info("\n" + "=" * 50)
+    logger.info("🎯 Test completed! Check the results above.")
     return True
 
+if pytest is not None:
+    @pytest.fixture(scope="session")
+    def client():
+        """Pooled session shared by the tests, which skip when the backend isn't running"""
+        session = make_session(pool_maxsize=8)
+        try:
+            session.get(HEALTH_URL, timeout=(CONNECT_TIMEOUT, 5))
+        except requests.ConnectionError:
+            session.close()
+            pytest.skip(f"Backend not running at {BASE_URL}")
+        yield session
+        session.close()
+
+def test_health(client):
+    response = client.get(HEALTH_URL, timeout=(CONNECT_TIMEOUT, 5))
+    assert response.status_code == 200
+    data = _load(response)
+    assert data["status"] == "healthy"
+    assert "ai_provider" in data
+
+def test_providers(client):
+    response = client.get(PROVIDERS_URL, timeout=(CONNECT_TIMEOUT, 5))
+    assert response.status_code == 200
+    providers = _load(response).get("providers", [])
+    assert providers
+    assert all("name" in provider for provider in providers)
+
+def test_suggest_questions(client):
+    response = client.post(SUGGEST_URL, data=SUGGEST_BODY, timeout=(CONNECT_TIMEOUT, 10))
+    assert response.status_code == 200
+    data = _load(response)
+    assert data.get("success"), data.get("error")
+    assert all("question" in question for question in data.get("questions", []))
+
 if __name__ == "__main__":
-    test_server()
+    # Bare messages keep the report readable; LOG_LEVEL=WARNING shows only problems
+    logging.basicConfig(level=os.environ.get("LOG_LEVEL", "INFO"), format="%(message)s")
+    main()